@@ -0,0 +1,192 @@
+# batch_scheduler.py - Dynamic micro-batching of concurrent translate calls
+
+import queue
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import Future
+
+from text_processing import split_urdu_sentences, ultra_clean_urdu
+
+
+class MicroBatchScheduler:
+    """Collects concurrent translate calls into one padded batch.
+
+    A background worker waits up to ``max_wait_ms`` after the first queued
+    request (or until ``max_batch_size`` requests are waiting), then runs
+    them through ``translator.translate_batch`` and resolves each caller's
+    future. Requests with different decoding parameters are batched
+    separately. ``translate`` has the same signature and return value as
+    UrduRomanTranslator.translate; the returned time includes queueing.
+
+    There is deliberately no ``translate_stream``: a streamed request decodes
+    one sentence step by step on its own and could never share a batch, so
+    callers that stream when they can (the Streamlit app) send their
+    requests through the queue instead and show the reply whole. Enabling
+    batching therefore trades token streaming for shared forward passes.
+    ``translate_document`` queues single-sentence input like ``translate``
+    and hands multi-sentence input, which is already one batch of sentences,
+    to the wrapped translator.
+    """
+
+    def __init__(self, translator, max_batch_size=16, max_wait_ms=5.0, max_queue_size=256):
+        self.translator = translator
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue_size = max_queue_size
+
+        self.metrics = getattr(translator, 'metrics', None)
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._stats_lock = threading.Lock()
+        self._closed = False
+
+        # Metrics
+        self.total_requests = 0
+        self.total_batches = 0
+        self.rejected_requests = 0
+        self.total_queue_time = 0.0
+        self.max_queue_time = 0.0
+        self.batch_sizes = Counter()
+
+        self._worker = threading.Thread(target=self._run, name='micro-batch-scheduler', daemon=True)
+        self._worker.start()
+
+    # Pass-through attributes used by the UI
+    @property
+    def session_stats(self):
+        return self.translator.session_stats
+
+    def reset_stats(self):
+        self.translator.reset_stats()
+
+    @property
+    def is_ready(self):
+        return getattr(self.translator, 'is_ready', True)
+
+    def wait_until_ready(self, timeout=None):
+        if hasattr(self.translator, 'wait_until_ready'):
+            return self.translator.wait_until_ready(timeout)
+        return True
+
+    def translate_document(self, urdu_text, max_length=200, beam_size=1, batch_size=32):
+        """Translate a multi-sentence text; a single sentence joins the shared queue."""
+        segments = split_urdu_sentences(urdu_text)[0::2]
+        if sum(1 for segment in segments if ultra_clean_urdu(segment)) <= 1:
+            return self.translate(urdu_text, max_length=max_length, beam_size=beam_size)
+        return self.translator.translate_document(
+            urdu_text, max_length=max_length, beam_size=beam_size, batch_size=batch_size
+        )
+
+    @property
+    def best_bleu(self):
+        return self.translator.best_bleu
+
+    @property
+    def device(self):
+        return self.translator.device
+
+    def submit(self, urdu_text, max_length=200, beam_size=1):
+        """Queue a request and return a Future of (translation, time).
+
+        Raises queue.Full when max_queue_size requests are already waiting.
+        """
+        future = Future()
+        try:
+            self._queue.put_nowait((urdu_text, max_length, beam_size, time.perf_counter(), future))
+        except queue.Full:
+            with self._stats_lock:
+                self.rejected_requests += 1
+            if self.metrics:
+                self.metrics.record_error('queue_full')
+            raise
+        return future
+
+    def translate(self, urdu_text, max_length=200, beam_size=1, timeout=None):
+        """Translate through the shared batch; blocks until the result is ready."""
+        if self._closed:
+            return self.translator.translate(urdu_text, max_length=max_length, beam_size=beam_size)
+
+        try:
+            future = self.submit(urdu_text, max_length=max_length, beam_size=beam_size)
+        except queue.Full:
+            return "Error: Translation queue is full, please retry", 0
+
+        return future.result(timeout)
+
+    def close(self):
+        """Stop the worker after the queued requests; later calls run synchronously."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+
+    def _run(self):
+        """Worker loop: gather a batch, then translate it."""
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+
+            batch = [first]
+            deadline = first[3] + self.max_wait
+            while len(batch) < self.max_batch_size:
+                # Requests already waiting are always taken; otherwise wait until the deadline
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._process(batch)
+
+    def _process(self, batch):
+        """Translate one collected batch and resolve its futures."""
+        batch_start = time.perf_counter()
+        queue_times = [batch_start - item[3] for item in batch]
+        if self.metrics:
+            for queue_time in queue_times:
+                self.metrics.queue_wait.observe(queue_time)
+
+        # Requests with different decoding parameters cannot share a pass
+        groups = defaultdict(list)
+        for item in batch:
+            groups[(item[1], item[2])].append(item)
+
+        for (max_length, beam_size), items in groups.items():
+            try:
+                results = self.translator.translate_batch(
+                    [item[0] for item in items], max_length=max_length,
+                    batch_size=len(items), beam_size=beam_size
+                )
+            except Exception as e:
+                for item in items:
+                    item[4].set_exception(e)
+                continue
+
+            for item, (translation, _) in zip(items, results):
+                item[4].set_result((translation, time.perf_counter() - item[3]))
+
+        with self._stats_lock:
+            self.total_requests += len(batch)
+            self.total_batches += 1
+            self.batch_sizes[len(batch)] += 1
+            self.total_queue_time += sum(queue_times)
+            self.max_queue_time = max(self.max_queue_time, max(queue_times))
+
+    def stats(self):
+        """Snapshot of scheduler metrics."""
+        with self._stats_lock:
+            return {
+                'requests': self.total_requests,
+                'batches': self.total_batches,
+                'rejected': self.rejected_requests,
+                'queue_depth': self._queue.qsize(),
+                'avg_batch_size': self.total_requests / self.total_batches if self.total_batches else 0.0,
+                'batch_sizes': dict(sorted(self.batch_sizes.items())),
+                'avg_queue_time': self.total_queue_time / self.total_requests if self.total_requests else 0.0,
+                'max_queue_time': self.max_queue_time
+            }
@@ -0,0 +1,73 @@
+# bench_attention.py - Per-step cost of BahdanauAttention with and without a prepared cache
+#
+# Run from the repository root:
+#     python -m benchmarks.bench_attention --src-len 60 --steps 80
+
+import argparse
+import time
+
+import torch
+
+from model_wrapper import BahdanauAttention
+
+
+def time_steps(fn, steps, repeats):
+    """Return the best per-step time in milliseconds over several repeats."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(steps)
+        best = min(best, (time.perf_counter() - start) / steps)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark attention prepare/step against forward")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8, 64])
+    parser.add_argument('--src-len', type=int, default=60)
+    parser.add_argument('--steps', type=int, default=80)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--hidden-dim', type=int, default=512)
+    parser.add_argument('--attention-dim', type=int, default=256)
+    parser.add_argument('--threads', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    torch.manual_seed(0)
+    attention = BahdanauAttention(args.hidden_dim, args.hidden_dim, args.attention_dim).eval()
+
+    print(f"src_len={args.src_len} steps={args.steps} threads={torch.get_num_threads()}")
+    print(f"{'batch':>6} {'forward ms/step':>16} {'step ms/step':>13} {'speedup':>8}")
+
+    for batch_size in args.batch_sizes:
+        encoder_outputs = torch.randn(batch_size, args.src_len, args.hidden_dim)
+        src_lengths = torch.randint(args.src_len // 2, args.src_len + 1, (batch_size,))
+        src_lengths[0] = args.src_len
+        decoder_hidden = torch.randn(batch_size, args.hidden_dim)
+
+        def run_forward(steps):
+            for _ in range(steps):
+                attention(encoder_outputs, decoder_hidden, src_lengths)
+
+        def run_prepared(steps):
+            cache = attention.prepare(encoder_outputs, src_lengths)
+            for _ in range(steps):
+                attention.step(cache, decoder_hidden)
+
+        with torch.no_grad():
+            # Both paths must agree before timing them
+            expected, _ = attention(encoder_outputs, decoder_hidden, src_lengths)
+            actual, _ = attention.step(attention.prepare(encoder_outputs, src_lengths), decoder_hidden)
+            assert torch.allclose(expected, actual, atol=1e-5), "prepared attention diverges from forward"
+
+            run_prepared(2)
+            forward_ms = time_steps(run_forward, args.steps, args.repeats)
+            prepared_ms = time_steps(run_prepared, args.steps, args.repeats)
+
+        print(f"{batch_size:>6} {forward_ms:>16.4f} {prepared_ms:>13.4f} {forward_ms / prepared_ms:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# bench_decoder_step.py - Per-step latency of the eager decoder step against the TorchScript engine
+#
+# Run from the repository root (random weights, no checkpoint needed):
+#     python -m benchmarks.bench_decoder_step --batch-sizes 1 8 64
+
+import argparse
+import time
+
+import torch
+
+from benchmarks.common import build_random_model, random_source_batch, latency_summary
+from decoder_engine import DecoderStepEngine
+
+
+def time_steps(step_fn, decoder, encoder_state, src_lengths, steps):
+    """Run steps decoder steps from BOS and return per-step durations."""
+    encoder_outputs, encoder_hidden, encoder_cell = encoder_state
+    hidden_states, cell_states = decoder.init_hidden_states(encoder_outputs, encoder_hidden, encoder_cell)
+    attention_cache = decoder.attention.prepare(encoder_outputs, src_lengths)
+    input_token = torch.full((encoder_outputs.size(0), 1), 3, dtype=torch.long)
+
+    durations = []
+    for _ in range(steps):
+        start = time.perf_counter()
+        logits, hidden_states, cell_states, _ = step_fn(
+            input_token, hidden_states, cell_states, encoder_outputs, src_lengths,
+            attention_cache=attention_cache
+        )
+        input_token = logits.argmax(dim=1, keepdim=True)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the compiled decoder step")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8, 64])
+    parser.add_argument('--src-len', type=int, default=30)
+    parser.add_argument('--steps', type=int, default=100)
+    parser.add_argument('--threads', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    model = build_random_model()
+    decoder = model.decoder
+    engine = DecoderStepEngine(decoder)
+    print(f"engine mode={engine.mode} threads={torch.get_num_threads()} steps={args.steps}")
+    print(f"{'batch':>6} {'eager p50 ms':>13} {'eager p95 ms':>13} {'engine p50 ms':>14} "
+          f"{'engine p95 ms':>14} {'speedup':>8}")
+
+    with torch.no_grad():
+        for batch_size in args.batch_sizes:
+            src_ids, src_lengths = random_source_batch(batch_size, args.src_len)
+            encoder_state = model.encoder(src_ids, src_lengths)
+
+            # Both paths must agree before timing them
+            eager_logits = decoder(*encoder_state, src_lengths, max_length=5)
+            engine_logits = decoder(*encoder_state, src_lengths, max_length=5, step_fn=engine)
+            assert torch.allclose(eager_logits, engine_logits, atol=1e-4), "compiled step diverges from eager"
+
+            # Warm up (TorchScript profiles and optimizes on the first calls)
+            for step_fn in (decoder.forward_step, engine):
+                time_steps(step_fn, decoder, encoder_state, src_lengths, 5)
+
+            eager = latency_summary(time_steps(decoder.forward_step, decoder, encoder_state, src_lengths, args.steps))
+            compiled = latency_summary(time_steps(engine, decoder, encoder_state, src_lengths, args.steps))
+            print(f"{batch_size:>6} {eager['p50_ms']:>13.3f} {eager['p95_ms']:>13.3f} "
+                  f"{compiled['p50_ms']:>14.3f} {compiled['p95_ms']:>14.3f} "
+                  f"{eager['p50_ms'] / compiled['p50_ms']:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# bench_greedy_decode.py - Full-logits greedy decoding against the token-id-only path
+#
+# Run from the repository root (random weights, no checkpoint needed):
+#     python -m benchmarks.bench_greedy_decode --batch-sizes 1 16 64 --max-length 200
+#
+# Random weights rarely emit EOS, so every row runs to max_length: the worst
+# case for the [batch, steps, vocab] logits the old path keeps.
+
+import argparse
+import time
+
+import torch
+
+from benchmarks.common import build_random_model, random_source_batch
+
+
+def best_of(fn, repeats):
+    """Fastest of ``repeats`` calls, in seconds, and the last result."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark token-id-only greedy decoding")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 16, 64])
+    parser.add_argument('--src-len', type=int, default=30)
+    parser.add_argument('--max-length', type=int, default=200)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--threads', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    model = build_random_model()
+    decoder = model.decoder
+    print(f"threads={torch.get_num_threads()} max_length={args.max_length}")
+    print(f"{'batch':>6} {'logits ms':>10} {'ids ms':>10} {'speedup':>8} {'logits MB':>10} {'ids MB':>8}")
+
+    with torch.no_grad():
+        for batch_size in args.batch_sizes:
+            src_ids, src_lengths = random_source_batch(batch_size, args.src_len)
+            encoder_state = model.encoder(src_ids, src_lengths)
+
+            full_time, logits = best_of(
+                lambda: decoder(*encoder_state, src_lengths, max_length=args.max_length), args.repeats
+            )
+            ids_time, tokens = best_of(
+                lambda: decoder.greedy_decode(*encoder_state, src_lengths, max_length=args.max_length), args.repeats
+            )
+            assert torch.equal(logits.argmax(dim=-1), tokens), "token-id path diverges from full logits"
+
+            logits_mb = logits.numel() * logits.element_size() / 1e6
+            ids_mb = tokens.numel() * tokens.element_size() / 1e6
+            print(f"{batch_size:>6} {full_time * 1000:>10.1f} {ids_time * 1000:>10.1f} "
+                  f"{full_time / ids_time:>7.2f}x {logits_mb:>10.1f} {ids_mb:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# bench_load.py - Cold-start time and peak RSS of fast (mmap) vs legacy checkpoint loading
+#
+# Run from the repository root:
+#     python -m benchmarks.bench_load                      # random-weight checkpoint in a temp dir
+#     python -m benchmarks.bench_load --checkpoint best_attention_model.pth
+#
+# Every load runs in a fresh interpreter, so each number is one process's
+# load time (imports excluded) and the peak RSS that loading added. The OS
+# page cache stays warm between runs, as it would for a restarted worker.
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def load_once(checkpoint, fast):
+    """Child process: load the checkpoint and report time and peak RSS as JSON."""
+    import torch
+    from model_wrapper import load_seq2seq_checkpoint
+
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    model, _, fast_used = load_seq2seq_checkpoint(checkpoint, 15000, 12000, torch.device('cpu'), fast=fast)
+    load_time = time.perf_counter() - start
+
+    # Touch every weight once, as the first translation would
+    with torch.no_grad():
+        checksum = sum(float(p.sum()) for p in model.parameters())
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(json.dumps({
+        'fast': fast_used, 'load_s': load_time, 'checksum': checksum,
+        'rss_added_mb': (peak_rss - baseline_rss) / 1024
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark checkpoint loading")
+    parser.add_argument('--checkpoint', default=None)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--child', choices=['fast', 'legacy'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        load_once(args.checkpoint, args.child == 'fast')
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        checkpoint = args.checkpoint
+        if checkpoint is None:
+            import torch
+            from benchmarks.common import build_random_model
+
+            checkpoint = os.path.join(temp_dir, 'random_model.pth')
+            torch.save({'model_state_dict': build_random_model().state_dict(), 'config': {}, 'best_bleu': 0.0},
+                       checkpoint)
+        print(f"Checkpoint: {checkpoint} ({os.path.getsize(checkpoint) / 1e6:.1f} MB)")
+
+        checksums = set()
+        for mode in ('legacy', 'fast'):
+            runs = []
+            for _ in range(args.repeats):
+                output = subprocess.run(
+                    [sys.executable, '-m', 'benchmarks.bench_load', '--child', mode, '--checkpoint', checkpoint],
+                    capture_output=True, text=True, check=True
+                ).stdout
+                runs.append(json.loads(output.strip().splitlines()[-1]))
+
+            checksums.add(round(runs[0]['checksum'], 3))
+            best = min(runs, key=lambda run: run['load_s'])
+            print(f"{mode:>6}: load {best['load_s'] * 1000:8.1f} ms, "
+                  f"peak RSS +{max(run['rss_added_mb'] for run in runs):7.1f} MB"
+                  f"{'' if runs[0]['fast'] == (mode == 'fast') else '  (fell back to legacy)'}")
+
+        print("✅ Same weights from both paths" if len(checksums) == 1 else "❌ Weights differ between paths")
+
+
+if __name__ == "__main__":
+    main()
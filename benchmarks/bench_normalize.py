@@ -0,0 +1,108 @@
+# bench_normalize.py - Equivalence check and timing of ultra_clean_urdu against the original implementation
+#
+# Run from the repository root:
+#     python -m benchmarks.bench_normalize --sentences 20000
+
+import argparse
+import random
+import re
+import time
+import unicodedata
+
+from benchmarks.common import load_vocab_pieces
+from model_wrapper import ultra_clean_urdu, clean_urdu_batch
+
+
+def legacy_ultra_clean_urdu(text: str) -> str:
+    """The original multi-pass cleaning function, kept as the reference."""
+    if not isinstance(text, str):
+        return ""
+
+    # Multiple normalization passes
+    text = unicodedata.normalize("NFC", text)
+
+    # Remove all diacritics
+    diacritics_pattern = re.compile(r"[\u064B-\u065F\u0670\u06D6-\u06ED\u08F0-\u08FF]")
+    text = diacritics_pattern.sub("", text)
+
+    # Comprehensive Arabic to Urdu normalization
+    replacements = {
+        "ك": "ک", "ي": "ی", "ة": "ہ", "أ": "ا", "إ": "ا", "آ": "ا",
+        "ؤ": "و", "ئ": "ی", "ء": "", "ً": "", "ٌ": "", "ٍ": "",
+        "َ": "", "ُ": "", "ِ": "", "ّ": "", "ْ": "", "ٰ": ""
+    }
+
+    for old, new in replacements.items():
+        text = text.replace(old, new)
+
+    # Clean whitespace around punctuation
+    text = re.sub(r'\s*([۔،؍؎؏؞؟])\s*', r' \1 ', text)
+    text = re.sub(r'\s+', ' ', text)
+
+    # Remove non-Urdu characters but keep essential punctuation
+    text = re.sub(r'[^\u0600-\u06FF\s۔،؍؎؏؞؟]', ' ', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+
+    return text
+
+
+def generate_noisy_sentences(pieces, count, seed=0):
+    """Build noisy Urdu-like sentences: vocab pieces mixed with diacritics, Arabic forms, Latin and spacing."""
+    rng = random.Random(seed)
+    noise = list("ًٌٍَُِّْٰۖۗ ك ي ة أ إ آ ؤ ئ ء ۔،؟؍ \t\n  abcXYZ0123456789.,!?آئ")
+    sentences = []
+    for _ in range(count):
+        words = []
+        for _ in range(rng.randint(1, 40)):
+            word = rng.choice(pieces)
+            if rng.random() < 0.3:
+                position = rng.randint(0, len(word))
+                word = word[:position] + rng.choice(noise) + word[position:]
+            words.append(word)
+        sentences.append(rng.choice(['', ' ', '  ']).join(words) + rng.choice(['', '۔', ' ؟', '\n']))
+    return sentences
+
+
+def best_time(fn, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare ultra_clean_urdu with the original implementation")
+    parser.add_argument('--vocab', default='urdu_level0.vocab')
+    parser.add_argument('--sentences', type=int, default=20000)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    sentences = generate_noisy_sentences(load_vocab_pieces(args.vocab), args.sentences, args.seed)
+    sentences += ["", "   ", "abc", "ا\u0653ب", "ي\u0654 و\u0654", "ه\u0654", None, 42]
+
+    # Equivalence on the generated corpus and on every single code point
+    mismatches = [text for text in sentences if ultra_clean_urdu(text) != legacy_ultra_clean_urdu(text)]
+    mismatches += [chr(cp) for cp in range(0x110000)
+                   if not 0xD800 <= cp <= 0xDFFF
+                   and ultra_clean_urdu(f"ا{chr(cp)}ب") != legacy_ultra_clean_urdu(f"ا{chr(cp)}ب")]
+    if mismatches:
+        print(f"❌ {len(mismatches)} mismatches, first: {mismatches[0]!r}")
+        raise SystemExit(1)
+    print(f"✅ Outputs identical on {len(sentences):,} sentences and all code points")
+
+    sentences = [text for text in sentences if isinstance(text, str)]
+    total_chars = sum(len(text) for text in sentences)
+    legacy = best_time(lambda: [legacy_ultra_clean_urdu(text) for text in sentences], args.repeats)
+    compiled = best_time(lambda: clean_urdu_batch(sentences), args.repeats)
+
+    for name, seconds in (('legacy', legacy), ('compiled', compiled)):
+        print(f"{name:>9}: {seconds * 1e6 / len(sentences):8.2f} us/sentence "
+              f"{total_chars / seconds / 1e6:8.2f} Mchars/s")
+    print(f"  speedup: {legacy / compiled:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
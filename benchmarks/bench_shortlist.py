@@ -0,0 +1,73 @@
+# bench_shortlist.py - Accuracy/speed trade-off of the lexical shortlist against the full softmax
+#
+# Run from the repository root:
+#     python -m benchmarks.bench_shortlist --shortlist shortlist.json --corpus data/test.tsv
+#
+# The corpus is a UTF-8 TSV of "urdu<TAB>roman" pairs (or plain Urdu lines,
+# in which case only agreement with the full-vocabulary output is reported).
+
+import argparse
+import time
+
+import sacrebleu
+
+from benchmarks.common import character_error_rate, load_corpus
+from model_wrapper import UrduRomanTranslator, LexicalShortlist, ultra_clean_urdu
+
+SAMPLE_PATH = 'benchmarks/sample_urdu.txt'
+
+
+def run(translator, sources, batch_size, repeats):
+    """Best-of-N wall time for translating all sources, plus the outputs."""
+    best, outputs = float('inf'), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        outputs = [t for t, _ in translator.translate_batch(sources, batch_size=batch_size)]
+        best = min(best, time.perf_counter() - start)
+    return outputs, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report the shortlist accuracy/speed trade-off")
+    parser.add_argument('--model', default='best_attention_model.pth')
+    parser.add_argument('--shortlist', required=True)
+    parser.add_argument('--corpus', default=SAMPLE_PATH)
+    parser.add_argument('--limit', type=int, default=1000)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 16, 64])
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    pairs = load_corpus(args.corpus, args.limit)
+    sources = [urdu for urdu, _ in pairs]
+    references = [roman for _, roman in pairs]
+
+    translator = UrduRomanTranslator(model_path=args.model, cache_size=0)
+    shortlist = LexicalShortlist(args.shortlist)
+
+    # Candidate set sizes per sentence
+    sizes = [shortlist.candidates([translator.src_tokenizer.encode_multilevel(ultra_clean_urdu(text))['level0']],
+                                  'cpu').numel() for text in sources]
+    vocab_size = translator.tgt_tokenizer.get_vocab_size('level0')
+    print(f"Sentences: {len(sources)}  avg candidates: {sum(sizes) / len(sizes):.0f} / {vocab_size:,}")
+
+    print(f"{'batch':>6} {'full s':>8} {'shortlist s':>12} {'speedup':>8}")
+    outputs = {}
+    for batch_size in args.batch_sizes:
+        translator.shortlist = None
+        outputs['full'], full_time = run(translator, sources, batch_size, args.repeats)
+        translator.shortlist = shortlist
+        outputs['shortlist'], short_time = run(translator, sources, batch_size, args.repeats)
+        print(f"{batch_size:>6} {full_time:>8.2f} {short_time:>12.2f} {full_time / short_time:>7.2f}x")
+
+    agreement = sum(a == b for a, b in zip(outputs['full'], outputs['shortlist'])) / len(sources)
+    print(f"\nIdentical to full softmax: {agreement:.1%}")
+
+    if all(ref is not None for ref in references):
+        for name in ('full', 'shortlist'):
+            bleu = sacrebleu.corpus_bleu(outputs[name], [references]).score
+            cer = character_error_rate(outputs[name], references)
+            print(f"{name:>9}: BLEU {bleu:6.2f}  CER {cer:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# common.py - Shared helpers for the benchmark scripts
+
+import random
+
+import Levenshtein
+import numpy as np
+import torch
+
+from model_wrapper import EnhancedSeq2SeqModel
+
+
+def build_random_model(src_vocab_size=15000, tgt_vocab_size=12000, embedding_dim=512,
+                       hidden_dim=512, attention_dim=256, seed=0):
+    """EnhancedSeq2SeqModel with the deployed shapes and random weights (no checkpoint needed)."""
+    torch.manual_seed(seed)
+    model = EnhancedSeq2SeqModel(
+        src_vocab_size=src_vocab_size,
+        tgt_vocab_size=tgt_vocab_size,
+        embedding_dim=embedding_dim,
+        encoder_hidden_dim=hidden_dim,
+        decoder_hidden_dim=hidden_dim,
+        dropout=0.1,
+        attention_dim=attention_dim
+    )
+    return model.eval()
+
+
+def random_source_batch(batch_size, src_len, vocab_size=15000, seed=0):
+    """Random source ids of one length with BOS/EOS, plus their lengths."""
+    generator = torch.Generator().manual_seed(seed)
+    src_ids = torch.randint(4, vocab_size, (batch_size, src_len), generator=generator)
+    src_ids[:, 0] = 3
+    src_ids[:, -1] = 1
+    return src_ids, torch.full((batch_size,), src_len, dtype=torch.long)
+
+
+def latency_summary(seconds):
+    """p50/p95/p99 and mean of a list of durations, in milliseconds."""
+    values = np.asarray(seconds) * 1000
+    return {
+        'p50_ms': float(np.percentile(values, 50)),
+        'p95_ms': float(np.percentile(values, 95)),
+        'p99_ms': float(np.percentile(values, 99)),
+        'mean_ms': float(values.mean())
+    }
+
+
+def load_vocab_pieces(vocab_path='urdu_level0.vocab'):
+    """Read SentencePiece pieces (without the word marker) from a .vocab file."""
+    pieces = []
+    with open(vocab_path, encoding='utf-8') as f:
+        for line in f:
+            piece = line.split('\t', 1)[0].replace('▁', '')
+            if piece and not piece.startswith('<'):
+                pieces.append(piece)
+    return pieces
+
+
+def generate_sentences(pieces, count, min_words, max_words, seed=0):
+    """Seeded pseudo-sentences of min_words..max_words vocabulary pieces."""
+    rng = random.Random(seed)
+    return [' '.join(rng.choice(pieces) for _ in range(rng.randint(min_words, max_words)))
+            for _ in range(count)]
+
+
+def load_corpus(path, limit=None):
+    """Read (urdu, roman) pairs from a TSV; roman is None for a plain sentence list."""
+    pairs = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            fields = line.rstrip('\n').split('\t')
+            if fields[0].strip():
+                pairs.append((fields[0], fields[1] if len(fields) > 1 else None))
+            if limit and len(pairs) >= limit:
+                break
+    return pairs
+
+
+def character_error_rate(hypotheses, references):
+    """Character edit distance over total reference length."""
+    edits = sum(Levenshtein.distance(h, r) for h, r in zip(hypotheses, references))
+    return edits / max(sum(len(r) for r in references), 1)
@@ -0,0 +1,199 @@
+# run_benchmarks.py - Reproducible, offline performance benchmarks for the translation pipeline
+#
+# Run from the repository root:
+#     python -m benchmarks.run_benchmarks --output bench.json
+#     python -m benchmarks.run_benchmarks --output new.json --compare bench.json
+#
+# Stages: cleaning, SentencePiece encoding, encoder, greedy decoder and the
+# end-to-end UrduRomanTranslator.translate_batch. Each runs for every batch
+# size x input-length bucket x thread count and reports p50/p95/p99 latency
+# and throughput. Inputs come from benchmarks/sample_urdu.txt plus seeded
+# sentences generated from urdu_level0.vocab, so runs are comparable.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime
+
+import torch
+from torch.nn.utils.rnn import pad_sequence
+
+from benchmarks.common import build_random_model, generate_sentences, latency_summary, load_vocab_pieces
+from model_wrapper import UrduRomanTranslator, SimplifiedMultiLevelTokenizer, ultra_clean_urdu
+
+SAMPLE_PATH = 'benchmarks/sample_urdu.txt'
+
+# Input-length buckets in words: name -> (min, max)
+LENGTH_BUCKETS = {'short': (1, 8), 'medium': (9, 25), 'long': (26, 60)}
+
+
+def sentence_pool(bucket, count, seed):
+    """Bundled sentences that fall in the bucket, topped up with generated ones."""
+    min_words, max_words = LENGTH_BUCKETS[bucket]
+    with open(SAMPLE_PATH, encoding='utf-8') as f:
+        bundled = [line.strip() for line in f if min_words <= len(line.split()) <= max_words]
+    generated = generate_sentences(load_vocab_pieces(), max(count - len(bundled), 0), min_words, max_words, seed)
+    return (bundled + generated)[:count]
+
+
+def measure(fn, batches, iterations, warmup):
+    """Call fn on each batch in turn; return per-call durations after warm-up."""
+    for i in range(warmup):
+        fn(batches[i % len(batches)])
+    durations = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn(batches[i % len(batches)])
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    """Print rows whose p50 regressed by more than threshold versus a baseline file."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {
+            (r['stage'], r['batch_size'], r['length_bucket'], r['threads']): r for r in json.load(f)['results']
+        }
+
+    regressions = 0
+    for result in results:
+        key = (result['stage'], result['batch_size'], result['length_bucket'], result['threads'])
+        if key not in baseline:
+            continue
+        change = result['p50_ms'] / baseline[key]['p50_ms'] - 1
+        if change > threshold:
+            regressions += 1
+            print(f"❌ {key}: p50 {baseline[key]['p50_ms']:.3f} -> {result['p50_ms']:.3f} ms ({change:+.1%})")
+    print(f"{regressions} regression(s) above {threshold:.0%} against {baseline_path}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the translation pipeline")
+    parser.add_argument('--model', default='best_attention_model.pth')
+    parser.add_argument('--random-weights', action='store_true',
+                        help="Use a randomly initialized model (skips the end-to-end stage)")
+    parser.add_argument('--stages', nargs='+', default=['clean', 'tokenize', 'encoder', 'decoder', 'end_to_end'])
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--length-buckets', nargs='+', default=list(LENGTH_BUCKETS), choices=list(LENGTH_BUCKETS))
+    parser.add_argument('--threads', type=int, nargs='+', default=None,
+                        help="torch thread counts (default: 1 and all cores)")
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--decode-steps', type=int, default=200, help="max_length for decoder stages")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', default=None, help="Baseline JSON to check for regressions")
+    parser.add_argument('--regression-threshold', type=float, default=0.10)
+    args = parser.parse_args()
+
+    thread_counts = args.threads or sorted({1, os.cpu_count() or 1})
+    torch.manual_seed(args.seed)
+
+    # Model and tokenizers
+    translator = None
+    if args.random_weights:
+        model = build_random_model()
+        src_tokenizer = SimplifiedMultiLevelTokenizer('urdu', vocab_sizes=[15000])
+        if not src_tokenizer.load_pretrained('urdu_level0.model'):
+            raise FileNotFoundError("urdu_level0.model not found")
+        args.stages = [stage for stage in args.stages if stage != 'end_to_end']
+    else:
+        translator = UrduRomanTranslator(model_path=args.model, cache_size=0)
+        model, src_tokenizer = translator.model, translator.src_tokenizer
+    model.eval()
+
+    def encode_batch(texts):
+        ids = [torch.tensor(src_tokenizer.encode_multilevel(ultra_clean_urdu(text))['level0']) for text in texts]
+        return pad_sequence(ids, batch_first=True), torch.tensor([len(seq) for seq in ids])
+
+    results = []
+    for bucket in args.length_buckets:
+        for batch_size in args.batch_sizes:
+            pool = sentence_pool(bucket, batch_size * 4, args.seed)
+            batches = [pool[i:i + batch_size] for i in range(0, len(pool), batch_size)]
+            characters = sum(len(text) for text in pool) / len(batches)
+            encoded = [encode_batch(batch) for batch in batches]
+            encoder_states = []
+            with torch.no_grad():
+                for src_ids, src_lengths in encoded:
+                    encoder_states.append((model.encoder(src_ids, src_lengths), src_lengths))
+
+            stage_fns = {
+                'clean': (batches, lambda texts: [ultra_clean_urdu(text) for text in texts]),
+                'tokenize': (
+                    [[ultra_clean_urdu(text) for text in batch] for batch in batches],
+                    lambda texts: [src_tokenizer.encode_multilevel(text) for text in texts]
+                ),
+                'encoder': (encoded, lambda batch: model.encoder(*batch)),
+                'decoder': (
+                    encoder_states,
+                    lambda state: model.decoder(*state[0], state[1], max_length=args.decode_steps)
+                ),
+                'end_to_end': (
+                    batches,
+                    lambda texts: translator.translate_batch(
+                        texts, max_length=args.decode_steps, batch_size=batch_size
+                    )
+                )
+            }
+
+            for threads in thread_counts:
+                torch.set_num_threads(threads)
+                for stage in args.stages:
+                    stage_batches, fn = stage_fns[stage]
+                    with torch.no_grad():
+                        durations = measure(fn, stage_batches, args.iterations, args.warmup)
+
+                    summary = latency_summary(durations)
+                    mean_seconds = summary['mean_ms'] / 1000
+                    result = {
+                        'stage': stage,
+                        'batch_size': batch_size,
+                        'length_bucket': bucket,
+                        'threads': threads,
+                        'iterations': args.iterations,
+                        **summary,
+                        'items_per_s': batch_size / mean_seconds,
+                        'chars_per_s': characters / mean_seconds
+                    }
+                    results.append(result)
+                    print(f"{stage:>11} {bucket:>6} batch={batch_size:<3} threads={threads:<2} "
+                          f"p50={summary['p50_ms']:9.3f}ms p95={summary['p95_ms']:9.3f}ms "
+                          f"p99={summary['p99_ms']:9.3f}ms {result['items_per_s']:10.1f} items/s")
+
+    report = {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'torch': torch.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count(),
+            'random_weights': args.random_weights,
+            'args': vars(args)
+        },
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {args.output}")
+
+    if args.compare and compare(results, args.compare, args.regression_threshold):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
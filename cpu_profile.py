@@ -0,0 +1,74 @@
+# cpu_profile.py - Machine-specific threading profile written by scripts/autotune_cpu.py
+#
+# The profile records the best worker layout (processes x threads x batch
+# size) for server.py and the best thread count for a process that has the
+# machine to itself, on the machine it was tuned on.
+#
+# A standalone translator process (Streamlit replica, corpus CLI) takes one
+# share of the machine: the tuned layout's threads per worker by default, so
+# several such processes do not each claim every core. Set
+# $URDU_TRANSLATOR_PROCESSES to the number of translator processes that share
+# the machine (1 for a lone process, which then uses the single-process count).
+
+import json
+import os
+
+DEFAULT_PROFILE_PATH = 'cpu_profile.json'
+
+
+def load_cpu_profile(path=None):
+    """The saved profile as a dict, or None if there is none or it was tuned elsewhere.
+
+    ``path`` defaults to $URDU_TRANSLATOR_CPU_PROFILE, then cpu_profile.json.
+    """
+    path = path or os.environ.get('URDU_TRANSLATOR_CPU_PROFILE', DEFAULT_PROFILE_PATH)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, encoding='utf-8') as f:
+            profile = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not read CPU profile {path}: {e}")
+        return None
+
+    cpu_count = os.cpu_count()
+    if profile.get('host', {}).get('cpu_count') != cpu_count:
+        print(f"⚠️ CPU profile {path} was tuned for {profile.get('host', {}).get('cpu_count')} CPUs, "
+              f"this machine has {cpu_count}; ignoring it")
+        return None
+    return profile
+
+
+def process_threads(profile, processes=None):
+    """Intra-op threads for one of ``processes`` translator processes sharing the machine.
+
+    ``processes`` defaults to $URDU_TRANSLATOR_PROCESSES, then the tuned
+    server layout's worker count.
+    """
+    server = profile.get('server', {})
+    if processes is None:
+        processes = int(os.environ.get('URDU_TRANSLATOR_PROCESSES', 0)) or server.get('workers', 1)
+
+    if processes == 1:
+        return profile.get('single_process_threads', profile['intra_op_threads'])
+    if processes == server.get('workers'):
+        return server['threads_per_worker']
+    cores = profile.get('host', {}).get('cores_tuned') or os.cpu_count() or 1
+    return max(cores // processes, 1)
+
+
+def apply_thread_settings(profile, processes=None):
+    """Set torch intra-op and inter-op thread counts from a profile; returns the intra-op count."""
+    import torch
+
+    threads = process_threads(profile, processes)
+    torch.set_num_threads(threads)
+
+    # Inter-op threads can only be set before the first inter-op parallel work
+    try:
+        torch.set_interop_threads(profile['inter_op_threads'])
+    except RuntimeError:
+        if torch.get_num_interop_threads() != profile['inter_op_threads']:
+            print(f"⚠️ Inter-op threads already fixed at {torch.get_num_interop_threads()}")
+    return threads
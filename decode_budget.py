@@ -0,0 +1,62 @@
+# decode_budget.py - Source-length-adaptive decoder step budget
+#
+# Shared by the PyTorch and ONNX backends, so it does not import torch.
+# The ratio and margin are fitted by scripts/fit_decode_budget.py.
+
+import json
+import math
+import os
+
+DEFAULT_BUDGET_PATH = 'decode_budget.json'
+
+
+class DecodeBudget:
+    """Per-sequence decoder step budget derived from the source length.
+
+    budget = ceil(ratio * source_tokens + margin), capped at max_length,
+    where source_tokens counts BOS and EOS. Fitted on a parallel corpus by
+    scripts/fit_decode_budget.py; the defaults are deliberately loose.
+    """
+
+    DEFAULT_RATIO = 2.0
+    DEFAULT_MARGIN = 10.0
+
+    def __init__(self, ratio=DEFAULT_RATIO, margin=DEFAULT_MARGIN):
+        self.ratio = ratio
+        self.margin = margin
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(ratio=data['ratio'], margin=data['margin'])
+
+    def step_budget(self, src_len, max_length):
+        """Budget for one source of ``src_len`` tokens."""
+        return max(1, min(max_length, math.ceil(self.ratio * src_len + self.margin)))
+
+    def row_budgets(self, src_lengths, max_length):
+        """Budgets for a [batch] torch tensor of source lengths."""
+        budgets = (src_lengths.float() * self.ratio + self.margin).ceil().long()
+        return budgets.clamp(min=1, max=max(max_length, 1))
+
+
+def resolve_decode_budget(decode_budget=None):
+    """DecodeBudget from an instance, a JSON path, or the env/default file; None when disabled.
+
+    ``decode_budget=None`` reads $URDU_TRANSLATOR_DECODE_BUDGET, then
+    decode_budget.json, and falls back to the default ratio and margin.
+    """
+    if decode_budget is False:
+        return None
+    if isinstance(decode_budget, DecodeBudget):
+        return decode_budget
+
+    path = decode_budget or os.environ.get('URDU_TRANSLATOR_DECODE_BUDGET', DEFAULT_BUDGET_PATH)
+    if os.path.exists(path):
+        budget = DecodeBudget.load(path)
+        print(f"   Decode budget: ceil({budget.ratio:.2f} x source tokens + {budget.margin:.1f}) from {path}")
+        return budget
+    if decode_budget:
+        raise FileNotFoundError(f"Decode budget file {decode_budget} not found")
+    return DecodeBudget()
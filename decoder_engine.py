@@ -0,0 +1,110 @@
+# decoder_engine.py - TorchScript-compiled decoder step for inference
+
+from typing import List, Optional, Tuple
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+
+class _ScriptableDecoderStep(nn.Module):
+    """Dropout-free AttentionLSTMDecoder step over a prepared attention cache.
+
+    Shares its submodules (and therefore weights) with the decoder it wraps.
+    """
+
+    def __init__(self, decoder):
+        super().__init__()
+        self.embedding = decoder.embedding
+        self.embedding_norm = decoder.embedding_norm
+        self.decoder_projection = decoder.attention.decoder_projection
+        self.attention_vector = decoder.attention.attention_vector
+        self.lstm_cells = decoder.lstm_cells
+        self.layer_norms = decoder.layer_norms
+        self.context_projection = decoder.context_projection
+        self.output_projection = decoder.output_projection
+        self.final_output = decoder.final_output
+
+    def forward(self, input_token: torch.Tensor, hidden_states: List[torch.Tensor],
+                cell_states: List[torch.Tensor], encoder_outputs: torch.Tensor, keys: torch.Tensor,
+                pad_mask: Optional[torch.Tensor]
+                ) -> Tuple[torch.Tensor, List[torch.Tensor], List[torch.Tensor], torch.Tensor]:
+        # Embedding
+        embedded = self.embedding_norm(self.embedding(input_token.squeeze(1)))
+
+        # Attention
+        decoder_proj = self.decoder_projection(hidden_states[-1]).unsqueeze(1)
+        attention_scores = self.attention_vector(torch.tanh(keys + decoder_proj)).squeeze(-1)
+        if pad_mask is not None:
+            attention_scores = attention_scores.masked_fill(pad_mask, -1e9)
+        attention_weights = F.softmax(attention_scores, dim=-1)
+        context = torch.bmm(attention_weights.unsqueeze(1), encoder_outputs).squeeze(1)
+
+        # LSTM layers
+        lstm_input = torch.cat([embedded, context], dim=1)
+        new_hidden_states: List[torch.Tensor] = []
+        new_cell_states: List[torch.Tensor] = []
+        layer = 0
+        for cell, norm in zip(self.lstm_cells, self.layer_norms):
+            h, c = cell(lstm_input, (hidden_states[layer], cell_states[layer]))
+            h = norm(h)
+            new_hidden_states.append(h)
+            new_cell_states.append(c)
+            lstm_input = h
+            layer += 1
+
+        # Output computation
+        top_hidden = new_hidden_states[-1]
+        combined = torch.cat([top_hidden, self.context_projection(context)], dim=1)
+        output = F.gelu(self.output_projection(combined)) + top_hidden
+
+        return self.final_output(output), new_hidden_states, new_cell_states, attention_weights
+
+
+class DecoderStepEngine:
+    """Drop-in replacement for AttentionLSTMDecoder.forward_step.
+
+    Scripts and freezes the step with TorchScript to cut per-op Python
+    overhead. If compilation (or a compiled call) fails, it falls back to the
+    decoder's eager forward_step; shortlisted steps also run eagerly.
+    """
+
+    def __init__(self, decoder, enabled=True):
+        self.decoder = decoder
+        self.scripted = None
+
+        if enabled:
+            try:
+                step = torch.jit.script(_ScriptableDecoderStep(decoder).eval())
+                try:
+                    step = torch.jit.freeze(step)
+                except Exception as e:
+                    print(f"⚠️ TorchScript freeze skipped: {e}")
+                self.scripted = step
+            except Exception as e:
+                print(f"⚠️ TorchScript compilation failed, using eager decoder step: {e}")
+
+    @property
+    def mode(self):
+        return 'torchscript' if self.scripted is not None else 'eager'
+
+    def __call__(self, input_token, hidden_states, cell_states, encoder_outputs, src_lengths,
+                 attention_cache=None, output_layer=None):
+        # The compiled step always projects onto the full vocabulary
+        if self.scripted is not None and output_layer is None:
+            if attention_cache is None:
+                attention_cache = self.decoder.attention.prepare(encoder_outputs, src_lengths)
+
+            try:
+                return self.scripted(
+                    input_token, hidden_states, cell_states, attention_cache['encoder_outputs'],
+                    attention_cache['keys'], attention_cache['pad_mask']
+                )
+            except Exception as e:
+                print(f"⚠️ Compiled decoder step failed, switching to eager mode: {e}")
+                self.scripted = None
+
+        return self.decoder.forward_step(
+            input_token, hidden_states, cell_states, encoder_outputs, src_lengths,
+            attention_cache=attention_cache, output_layer=output_layer
+        )
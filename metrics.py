@@ -0,0 +1,230 @@
+# metrics.py - Prometheus text-format metrics with no external dependencies
+#
+# Counters and histograms live in a MetricsRegistry and are rendered in the
+# Prometheus text exposition format (version 0.0.4). They can be scraped from
+# a small local HTTP endpoint (start_http_server, or the /metrics route of
+# server.py) or written periodically to a .prom file for node_exporter's
+# textfile collector (start_textfile_writer).
+
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonically increasing value per label set."""
+
+    type_name = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {} if self.labelnames else {(): 0}  # unlabelled metrics report 0 from the start
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(str(labels[name]) for name in self.labelnames), 0)
+
+    def samples(self, const_labels):
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield self.name, const_labels + list(zip(self.labelnames, key)), value
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count per label set."""
+
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, buckets, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self.labelnames = tuple(labelnames)
+        self._values = {}  # label key -> [bucket counts, sum]
+        if not self.labelnames:
+            self._values[()] = [[0] * len(self.buckets), 0.0]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][index] += 1
+                    break
+            state[1] += value
+
+    def samples(self, const_labels):
+        with self._lock:
+            values = {key: (list(counts), total) for key, (counts, total) in self._values.items()}
+        for key, (counts, total) in sorted(values.items()):
+            labels = const_labels + list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield f'{self.name}_bucket', labels + [('le', _format_value(bound))], cumulative
+            yield f'{self.name}_sum', labels, total
+            yield f'{self.name}_count', labels, cumulative
+
+
+class MetricsRegistry:
+    """A set of metrics rendered together, with labels added to every sample."""
+
+    def __init__(self, const_labels=None):
+        self.const_labels = dict(const_labels or {})
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, buckets, labelnames=()):
+        return self.register(Histogram(name, documentation, buckets, labelnames))
+
+    def render(self):
+        """All metrics in Prometheus text format."""
+        const_labels = sorted(self.const_labels.items())
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {_escape(metric.documentation)}')
+            lines.append(f'# TYPE {metric.name} {metric.type_name}')
+            for name, labels, value in metric.samples(const_labels):
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path):
+        """Atomically write the rendered metrics to ``path``."""
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(temp_path, path)
+
+
+def start_http_server(registry, port, host='127.0.0.1'):
+    """Serve ``registry`` at http://host:port/metrics from a daemon thread."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    return server
+
+
+def start_textfile_writer(registry, path, interval=15.0):
+    """Rewrite ``path`` every ``interval`` seconds from a daemon thread."""
+
+    def run():
+        while True:
+            try:
+                registry.write_textfile(path)
+            except OSError as e:
+                print(f"⚠️ Could not write metrics to {path}: {e}")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=run, name='metrics-textfile', daemon=True)
+    thread.start()
+    return thread
+
+
+# Translator instruments
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+STAGE_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+STEP_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+QUEUE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+
+class TranslatorMetrics:
+    """The translator's counters and histograms, registered in one registry."""
+
+    def __init__(self, registry=None):
+        self.registry = registry if registry is not None else MetricsRegistry()
+        counter, histogram = self.registry.counter, self.registry.histogram
+
+        self.requests = counter('urdu_translator_requests_total', "Translation requests served", ['outcome'])
+        self.errors = counter('urdu_translator_errors_total', "Failed translation requests", ['reason'])
+        self.cache_lookups = counter('urdu_translator_cache_lookups_total', "Translation cache lookups", ['result'])
+        self.input_characters = counter('urdu_translator_input_characters_total', "Input characters translated")
+        self.output_tokens = counter('urdu_translator_output_tokens_total', "Target tokens generated")
+        self.decoded_sequences = counter('urdu_translator_decoded_sequences_total', "Sequences decoded by the model")
+        self.budget_hits = counter('urdu_translator_decode_budget_hits_total',
+                                   "Decoded sequences that stopped at their step budget instead of EOS")
+        self.latency = histogram('urdu_translator_request_duration_seconds',
+                                 "End-to-end translation time per request", LATENCY_BUCKETS)
+        self.stage_time = histogram('urdu_translator_stage_duration_seconds',
+                                    "Per-stage time of profiled requests", STAGE_BUCKETS, ['stage'])
+        self.decoder_steps = histogram('urdu_translator_decoder_steps',
+                                       "Decoder steps per model pass", STEP_BUCKETS)
+        self.batch_size = histogram('urdu_translator_batch_size', "Sequences per model pass", BATCH_BUCKETS)
+        self.queue_wait = histogram('urdu_translator_queue_wait_seconds',
+                                    "Time requests wait in the micro-batch queue", QUEUE_BUCKETS)
+
+    def record_error(self, reason, count=1):
+        self.requests.inc(count, outcome='error')
+        self.errors.inc(count, reason=reason)
+
+
+_default_metrics = None
+_default_lock = threading.Lock()
+
+
+def default_translator_metrics():
+    """Process-wide TranslatorMetrics shared by every translator instance."""
+    global _default_metrics
+    with _default_lock:
+        if _default_metrics is None:
+            _default_metrics = TranslatorMetrics()
+        return _default_metrics
@@ -6,92 +6,31 @@ import torch.nn.functional as F
 from torch.nn.utils.rnn import pad_sequence, pack_padded_sequence, pad_packed_sequence
 import os
 import json
-import sentencepiece as spm
-import unicodedata
-import re
 import time
+import sys
+import threading
+from collections import OrderedDict
 from datetime import datetime
 import math
 import numpy as np
 
+from cpu_profile import apply_thread_settings, load_cpu_profile
+from decode_budget import DecodeBudget, resolve_decode_budget  # DecodeBudget re-exported for callers
+from decoder_engine import DecoderStepEngine
+from metrics import default_translator_metrics
+from translation_stats import StageTimer, TranslationStats
+# iter_clean_urdu and clean_urdu_batch are unused here but re-exported, so existing
+# `from model_wrapper import ...` callers keep working now that the normalizer lives
+# in text_processing
+from text_processing import (
+    SimplifiedMultiLevelTokenizer, ultra_clean_urdu, iter_clean_urdu, clean_urdu_batch,
+    split_urdu_sentences, romanize_boundary, length_buckets
+)
+
 # Set device
 device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
 
 
-class SimplifiedMultiLevelTokenizer:
-    """Simplified multi-level tokenizer for deployment."""
-
-    def __init__(self, prefix, vocab_sizes=[15000]):
-        self.prefix = prefix
-        self.vocab_sizes = vocab_sizes
-        self.tokenizers = {}
-
-    def load_pretrained(self, model_file):
-        """Load pre-trained SentencePiece model."""
-        if os.path.exists(model_file):
-            sp = spm.SentencePieceProcessor()
-            sp.load(model_file)
-            self.tokenizers['level0'] = sp
-            print(f"Loaded {self.prefix} tokenizer with vocab size: {sp.get_piece_size()}")
-            return True
-        return False
-
-    def encode_multilevel(self, text):
-        """Encode text using primary level."""
-        if 'level0' not in self.tokenizers:
-            raise ValueError("Tokenizer not loaded")
-
-        primary_tokenizer = self.tokenizers['level0']
-        ids = [3] + primary_tokenizer.encode(text, out_type=int) + [1]  # BOS + text + EOS
-        return {'level0': ids}
-
-    def decode_multilevel(self, ids, level='level0'):
-        """Decode from specific level."""
-        if level in self.tokenizers:
-            clean_ids = [id for id in ids if id not in [0, 1, 3]]  # Remove PAD, EOS, BOS
-            return self.tokenizers[level].decode(clean_ids)
-        return ""
-
-    def get_vocab_size(self, level='level0'):
-        """Get vocabulary size for specific level."""
-        if level in self.tokenizers:
-            return self.tokenizers[level].get_piece_size()
-        return 0
-
-
-def ultra_clean_urdu(text: str) -> str:
-    """Enhanced Urdu cleaning for deployment."""
-    if not isinstance(text, str):
-        return ""
-
-    # Multiple normalization passes
-    text = unicodedata.normalize("NFC", text)
-
-    # Remove all diacritics
-    diacritics_pattern = re.compile(r"[\u064B-\u065F\u0670\u06D6-\u06ED\u08F0-\u08FF]")
-    text = diacritics_pattern.sub("", text)
-
-    # Comprehensive Arabic to Urdu normalization
-    replacements = {
-        "ك": "ک", "ي": "ی", "ة": "ہ", "أ": "ا", "إ": "ا", "آ": "ا",
-        "ؤ": "و", "ئ": "ی", "ء": "", "ً": "", "ٌ": "", "ٍ": "",
-        "َ": "", "ُ": "", "ِ": "", "ّ": "", "ْ": "", "ٰ": ""
-    }
-
-    for old, new in replacements.items():
-        text = text.replace(old, new)
-
-    # Clean whitespace around punctuation
-    text = re.sub(r'\s*([۔،؍؎؏؞؟])\s*', r' \1 ', text)
-    text = re.sub(r'\s+', ' ', text)
-
-    # Remove non-Urdu characters but keep essential punctuation
-    text = re.sub(r'[^\u0600-\u06FF\s۔،؍؎؏؞؟]', ' ', text)
-    text = re.sub(r'\s+', ' ', text).strip()
-
-    return text
-
-
 # Attention Mechanism
 class BahdanauAttention(nn.Module):
     """Bahdanau attention mechanism for deployment."""
@@ -107,36 +46,60 @@ class BahdanauAttention(nn.Module):
         self.attention_vector = nn.Linear(attention_dim, 1)
         self.dropout = nn.Dropout(0.1)
 
-    def forward(self, encoder_outputs, decoder_hidden, src_lengths=None):
+    def prepare(self, encoder_outputs, src_lengths=None):
+        """Precompute the per-source projection and padding mask for decoding."""
         batch_size, src_seq_len, _ = encoder_outputs.size()
 
-        # Project encoder outputs
-        encoder_proj = self.encoder_projection(encoder_outputs)
+        # Padding mask (True where a position must be ignored)
+        pad_mask = None
+        if src_lengths is not None:
+            pad_mask = torch.arange(src_seq_len, device=encoder_outputs.device).expand(
+                batch_size, src_seq_len
+            ) >= src_lengths.to(encoder_outputs.device).unsqueeze(1)
+
+        return {
+            'encoder_outputs': encoder_outputs,
+            'keys': self.encoder_projection(encoder_outputs),
+            'pad_mask': pad_mask
+        }
 
-        # Project decoder hidden state and expand
+    @staticmethod
+    def select_cache(cache, rows, src_seq_len=None):
+        """Select batch rows of a prepared cache, optionally trimming source length."""
+        selected = {}
+        for name, value in cache.items():
+            if value is not None:
+                value = value[rows]
+                if src_seq_len is not None:
+                    value = value[:, :src_seq_len]
+            selected[name] = value
+        return selected
+
+    def step(self, cache, decoder_hidden):
+        """Attend over a prepared cache for one decoder step."""
+        # Project decoder hidden state and broadcast over source positions
         decoder_proj = self.decoder_projection(decoder_hidden).unsqueeze(1)
-        decoder_proj = decoder_proj.expand(-1, src_seq_len, -1)
 
         # Compute attention scores
-        attention_input = torch.tanh(encoder_proj + decoder_proj)
+        attention_input = torch.tanh(cache['keys'] + decoder_proj)
         attention_scores = self.attention_vector(attention_input).squeeze(-1)
 
         # Apply length mask if provided
-        if src_lengths is not None:
-            mask = torch.arange(src_seq_len, device=encoder_outputs.device).expand(
-                batch_size, src_seq_len
-            ) < src_lengths.unsqueeze(1)
-            attention_scores = attention_scores.masked_fill(~mask, -1e9)
+        if cache['pad_mask'] is not None:
+            attention_scores = attention_scores.masked_fill(cache['pad_mask'], -1e9)
 
         # Apply softmax
         attention_weights = F.softmax(attention_scores, dim=-1)
         attention_weights = self.dropout(attention_weights)
 
         # Compute context vector
-        context = torch.bmm(attention_weights.unsqueeze(1), encoder_outputs).squeeze(1)
+        context = torch.bmm(attention_weights.unsqueeze(1), cache['encoder_outputs']).squeeze(1)
 
         return context, attention_weights
 
+    def forward(self, encoder_outputs, decoder_hidden, src_lengths=None):
+        return self.step(self.prepare(encoder_outputs, src_lengths), decoder_hidden)
+
 
 # Encoder
 class StabilizedEncoder(nn.Module):
@@ -251,15 +214,24 @@ class AttentionLSTMDecoder(nn.Module):
 
         return h_list, c_list
 
-    def forward_step(self, input_token, hidden_states, cell_states, encoder_outputs, src_lengths):
-        """Single forward step."""
+    def forward_step(self, input_token, hidden_states, cell_states, encoder_outputs, src_lengths,
+                     attention_cache=None, output_layer=None):
+        """Single forward step.
+
+        Pass ``attention_cache`` from ``self.attention.prepare`` to reuse the
+        encoder-side projection across steps, and ``output_layer`` from
+        ``shortlist_output_layer`` to compute logits over a candidate
+        vocabulary only (columns then follow the candidate order).
+        """
         # Embedding
         embedded = self.embedding(input_token.squeeze(1))
         embedded = self.embedding_norm(embedded)
         embedded = self.embedding_dropout(embedded)
 
         # Attention
-        context, attention_weights = self.attention(encoder_outputs, hidden_states[-1], src_lengths)
+        if attention_cache is None:
+            attention_cache = self.attention.prepare(encoder_outputs, src_lengths)
+        context, attention_weights = self.attention.step(attention_cache, hidden_states[-1])
 
         # LSTM layers
         lstm_input = torch.cat([embedded, context], dim=1)
@@ -285,35 +257,297 @@ class AttentionLSTMDecoder(nn.Module):
         output = self.dropout(output)
         output = output + top_hidden
 
-        logits = self.final_output(output)
+        if output_layer is None:
+            logits = self.final_output(output)
+        else:
+            logits = F.linear(output, output_layer[0], output_layer[1])
 
         return logits, new_hidden_states, new_cell_states, attention_weights
 
-    def forward(self, encoder_outputs, encoder_hidden, encoder_cell, src_lengths, max_length=200):
-        """Forward pass for inference."""
+    @staticmethod
+    def _row_budgets(max_lengths, max_length, device):
+        """Per-row budgets capped at max_length, and the loop bound they need."""
+        if max_lengths is None:
+            return None, max_length
+        row_budgets = max_lengths.to(device).clamp(max=max_length)
+        return row_budgets, int(row_budgets.max()) if row_budgets.numel() else max_length
+
+    def shortlist_output_layer(self, candidates):
+        """Rows of the output weight/bias for a candidate target vocabulary."""
+        weight, bias = self.final_output.weight, self.final_output.bias
+        if callable(weight):  # dynamically quantized Linear
+            weight, bias = weight().dequantize(), bias()
+        return weight.index_select(0, candidates), bias.index_select(0, candidates)
+
+    def greedy_steps(self, encoder_outputs, encoder_hidden, encoder_cell, src_lengths, max_length=200,
+                     step_fn=None, candidates=None, max_lengths=None):
+        """Greedy decoding loop shared by forward, greedy_decode and streaming.
+
+        Yields ``(step, active_rows, output, input_token)`` once per step: the
+        step output of the rows still decoding (columns follow ``candidates``
+        when a shortlist is given), their indices in the original batch and
+        the chosen target ids as an [active, 1] tensor. Afterwards rows that
+        emitted EOS or reached their step budget (``max_lengths``, capped by
+        ``max_length``) leave the active batch and attention padding no
+        remaining row needs is trimmed. ``step_fn`` replaces forward_step
+        (e.g. a compiled DecoderStepEngine).
+        """
+        step_fn = step_fn or self.forward_step
         batch_size = encoder_outputs.size(0)
         device = encoder_outputs.device
 
-        hidden_states, cell_states = self.init_hidden_states(encoder_outputs, encoder_hidden, encoder_cell)
+        # Lexical shortlist: slice the output layer once per batch
+        step_kwargs = {}
+        if candidates is not None:
+            step_kwargs['output_layer'] = self.shortlist_output_layer(candidates)
 
-        outputs = []
-        input_token = torch.full((batch_size, 1), 3, dtype=torch.long).to(device)  # BOS token
+        hidden_states, cell_states = self.init_hidden_states(encoder_outputs, encoder_hidden, encoder_cell)
+        input_token = torch.full((batch_size, 1), 3, dtype=torch.long, device=device)  # BOS token
+        active_rows = torch.arange(batch_size, device=device)
+        src_lengths = src_lengths.to(device)
+        attention_cache = self.attention.prepare(encoder_outputs, src_lengths)
+        row_budgets, max_length = self._row_budgets(max_lengths, max_length, device)
 
         for step in range(max_length):
-            output, hidden_states, cell_states, _ = self.forward_step(
-                input_token, hidden_states, cell_states, encoder_outputs, src_lengths
+            output, hidden_states, cell_states, _ = step_fn(
+                input_token, hidden_states, cell_states, attention_cache['encoder_outputs'], src_lengths,
+                attention_cache=attention_cache, **step_kwargs
             )
-            outputs.append(output.unsqueeze(1))
-
-            # Greedy decoding
             input_token = output.argmax(dim=1, keepdim=True)
-
-            # Early stopping
-            if (input_token == 1).all():  # EOS token
+            if candidates is not None:
+                input_token = candidates[input_token]
+            yield step, active_rows, output, input_token
+
+            # Per-sequence early stopping (EOS or the row's step budget)
+            finished = input_token.squeeze(1) == 1  # EOS token
+            if row_budgets is not None:
+                finished = finished | (row_budgets <= step + 1)
+            if finished.all():
                 break
 
+            if finished.any():
+                keep = ~finished
+                active_rows = active_rows[keep]
+                input_token = input_token[keep]
+                hidden_states = [h[keep] for h in hidden_states]
+                cell_states = [c[keep] for c in cell_states]
+                src_lengths = src_lengths[keep]
+                if row_budgets is not None:
+                    row_budgets = row_budgets[keep]
+
+                # Trim padding no remaining row attends to
+                attention_cache = self.attention.select_cache(attention_cache, keep, int(src_lengths.max()))
+
+    def forward(self, encoder_outputs, encoder_hidden, encoder_cell, src_lengths, max_length=200,
+                step_fn=None, candidates=None, max_lengths=None):
+        """Forward pass for inference.
+
+        Rows that emit EOS are dropped from the active batch, so later steps
+        only run for unfinished sequences. Finished rows get all-zero logits,
+        which argmax to PAD. ``step_fn`` replaces forward_step (e.g. a
+        compiled DecoderStepEngine). With ``candidates`` (a sorted tensor of
+        target ids) logits are only computed for those ids; all other
+        entries are -inf. ``max_lengths`` optionally gives every row its own
+        step budget (see DecodeBudget), capped by ``max_length``.
+        """
+        batch_size = encoder_outputs.size(0)
+        device = encoder_outputs.device
+        outputs = []
+
+        for _, active_rows, output, _ in self.greedy_steps(
+            encoder_outputs, encoder_hidden, encoder_cell, src_lengths, max_length=max_length,
+            step_fn=step_fn, candidates=candidates, max_lengths=max_lengths
+        ):
+            if candidates is not None:
+                full_output = output.new_full((output.size(0), self.vocab_size), float('-inf'))
+                full_output[:, candidates] = output
+                output = full_output
+
+            # Scatter active rows back into a full-batch step output
+            if active_rows.size(0) == batch_size:
+                outputs.append(output.unsqueeze(1))
+            else:
+                step_output = output.new_zeros(batch_size, self.vocab_size)
+                step_output[active_rows] = output
+                outputs.append(step_output.unsqueeze(1))
+
         return torch.cat(outputs, dim=1) if outputs else torch.zeros(batch_size, 1, self.vocab_size).to(device)
 
+    def greedy_decode(self, encoder_outputs, encoder_hidden, encoder_cell, src_lengths, max_length=200,
+                      step_fn=None, candidates=None, return_log_probs=False, max_lengths=None):
+        """Greedy decoding that keeps only the chosen token ids.
+
+        Produces the same tokens as ``forward(...).argmax(-1)`` (EOS, then PAD
+        once a row has finished) without materializing [batch, steps, vocab]
+        logits: ids go into a preallocated [batch, max_length] buffer trimmed
+        to the steps actually run. With ``return_log_probs`` a matching float
+        buffer holds each chosen token's log-probability (0 after EOS;
+        normalized over the shortlist when ``candidates`` is given).
+        ``max_lengths`` gives per-row step budgets as in ``forward``; a row
+        that reaches its budget stops without EOS.
+
+        Returns ``tokens`` or ``(tokens, log_probs)``.
+        """
+        batch_size = encoder_outputs.size(0)
+        device = encoder_outputs.device
+        _, buffer_length = self._row_budgets(max_lengths, max_length, device)
+
+        tokens = torch.zeros(batch_size, buffer_length, dtype=torch.long, device=device)
+        log_probs = torch.zeros(batch_size, buffer_length, device=device) if return_log_probs else None
+        steps = 0
+
+        for step, active_rows, output, input_token in self.greedy_steps(
+            encoder_outputs, encoder_hidden, encoder_cell, src_lengths, max_length=max_length,
+            step_fn=step_fn, candidates=candidates, max_lengths=max_lengths
+        ):
+            steps = step + 1
+            tokens[active_rows, step] = input_token.squeeze(1)
+            if return_log_probs:
+                # The chosen token is the argmax, so its log-probability is the row maximum
+                log_probs[active_rows, step] = F.log_softmax(output, dim=-1).max(dim=1).values
+
+        tokens = tokens[:, :steps]
+        if return_log_probs:
+            return tokens, log_probs[:, :steps]
+        return tokens
+
+    def beam_search(self, encoder_outputs, encoder_hidden, encoder_cell, src_lengths,
+                    beam_size=4, max_length=200, length_penalty=1.0, step_fn=None, candidates=None,
+                    max_lengths=None):
+        """Beam search decoding for a batch of sources.
+
+        All beams of all unfinished sentences run as one flattened
+        [sentences * beam_size] batch through forward_step, sharing a single
+        encoder pass. Hypotheses that emit EOS are moved out of the beam, and a
+        sentence is dropped from the batch once its finished hypotheses can no
+        longer be beaten. Scores are normalized by length ** length_penalty.
+        ``candidates`` restricts the output vocabulary and ``max_lengths``
+        sets per-sentence step budgets as in ``forward``; a sentence that
+        reaches its budget falls back to its live beams.
+
+        Returns the best token id list (without BOS/EOS) for every input row.
+        """
+        step_fn = step_fn or self.forward_step
+        batch_size = encoder_outputs.size(0)
+        device = encoder_outputs.device
+
+        # Lexical shortlist: slice the output layer once per batch
+        step_kwargs = {}
+        vocab_size = self.vocab_size
+        if candidates is not None:
+            step_kwargs['output_layer'] = self.shortlist_output_layer(candidates)
+            vocab_size = candidates.numel()
+
+        hidden_states, cell_states = self.init_hidden_states(encoder_outputs, encoder_hidden, encoder_cell)
+        src_lengths = src_lengths.to(device)
+        attention_cache = self.attention.prepare(encoder_outputs, src_lengths)
+        row_budgets, max_length = self._row_budgets(max_lengths, max_length, device)
+        budgets = row_budgets.tolist() if row_budgets is not None else None
+
+        # Expand every sentence to beam_size rows
+        expand = torch.arange(batch_size, device=device).repeat_interleave(beam_size)
+        hidden_states = [h[expand] for h in hidden_states]
+        cell_states = [c[expand] for c in cell_states]
+        attention_cache = self.attention.select_cache(attention_cache, expand)
+        src_lengths = src_lengths[expand]
+
+        # Only the first beam of each sentence is live at the start
+        beam_scores = torch.full((batch_size, beam_size), float('-inf'), device=device)
+        beam_scores[:, 0] = 0.0
+        tokens = torch.full((batch_size * beam_size, 1), 3, dtype=torch.long, device=device)  # BOS token
+
+        active = list(range(batch_size))  # original row of each active sentence
+        finished = [[] for _ in range(batch_size)]  # (normalized score, token ids), best first
+        beam_offsets = torch.arange(beam_size, device=device)
+
+        for step in range(max_length):
+            logits, hidden_states, cell_states, _ = step_fn(
+                tokens[:, -1:], hidden_states, cell_states, attention_cache['encoder_outputs'], src_lengths,
+                attention_cache=attention_cache, **step_kwargs
+            )
+            log_probs = F.log_softmax(logits, dim=-1)
+
+            num_active = len(active)
+            candidate_scores = (beam_scores.view(-1, 1) + log_probs).view(num_active, -1)
+            top_scores, top_indices = candidate_scores.topk(2 * beam_size, dim=1)
+            top_beams = top_indices // vocab_size
+            top_tokens = top_indices % vocab_size
+            if candidates is not None:
+                top_tokens = candidates[top_tokens]
+            flat_beams = top_beams + torch.arange(num_active, device=device).unsqueeze(1) * beam_size
+
+            # Move hypotheses ending in EOS out of the beam
+            is_eos = top_tokens == 1
+            new_finished = is_eos[:, :beam_size] & torch.isfinite(top_scores[:, :beam_size])
+            for row, rank in new_finished.nonzero().tolist():
+                hypothesis = tokens[flat_beams[row, rank], 1:].tolist()
+                score = top_scores[row, rank].item() / (len(hypothesis) + 1) ** length_penalty
+                hypotheses = finished[active[row]]
+                hypotheses.append((score, hypothesis))
+                hypotheses.sort(key=lambda item: item[0], reverse=True)
+                del hypotheses[beam_size:]
+
+            # Keep the best beam_size continuations that did not end
+            next_scores, order = top_scores.masked_fill(is_eos, float('-inf')).topk(beam_size, dim=1)
+            next_flat_beams = flat_beams.gather(1, order)
+            next_tokens = top_tokens.gather(1, order)
+
+            # Prune sentences whose finished hypotheses beat every live beam
+            best_live = (next_scores[:, 0] / (step + 1) ** length_penalty).tolist()
+            keep = []
+            for row in range(num_active):
+                hypotheses = finished[active[row]]
+                done = len(hypotheses) >= beam_size and hypotheses[-1][0] >= best_live[row]
+
+                # Out of budget: fall back to the live beams if nothing finished
+                if not done and budgets is not None and step + 1 >= budgets[active[row]]:
+                    done = True
+                    if not hypotheses:
+                        for beam in range(beam_size):
+                            score = next_scores[row, beam].item()
+                            if score != float('-inf'):
+                                hypothesis = tokens[next_flat_beams[row, beam], 1:].tolist()
+                                hypothesis.append(next_tokens[row, beam].item())
+                                hypotheses.append((score / len(hypothesis) ** length_penalty, hypothesis))
+                        hypotheses.sort(key=lambda item: item[0], reverse=True)
+
+                if not done and best_live[row] != float('-inf'):
+                    keep.append(row)
+
+            if not keep:
+                active = []
+                break
+
+            # Reorder beams and drop finished sentences
+            keep_rows = torch.tensor(keep, device=device)
+            flat_rows = next_flat_beams[keep_rows].view(-1)
+            hidden_states = [h[flat_rows] for h in hidden_states]
+            cell_states = [c[flat_rows] for c in cell_states]
+            tokens = torch.cat([tokens[flat_rows], next_tokens[keep_rows].view(-1, 1)], dim=1)
+            beam_scores = next_scores[keep_rows]
+
+            # Beams of one sentence share encoder rows, so only dropped sentences matter here
+            if len(keep) < num_active:
+                sentence_rows = (keep_rows.unsqueeze(1) * beam_size + beam_offsets).view(-1)
+                src_lengths = src_lengths[sentence_rows]
+                attention_cache = self.attention.select_cache(
+                    attention_cache, sentence_rows, int(src_lengths.max())
+                )
+            active = [active[row] for row in keep]
+
+        # Sentences that ran out of steps fall back to their live beams
+        for row, sentence in enumerate(active):
+            if finished[sentence]:
+                continue
+            for beam in range(beam_size):
+                score = beam_scores[row, beam].item()
+                if score != float('-inf'):
+                    hypothesis = tokens[row * beam_size + beam, 1:].tolist()
+                    finished[sentence].append((score / max(len(hypothesis), 1) ** length_penalty, hypothesis))
+            finished[sentence].sort(key=lambda item: item[0], reverse=True)
+
+        return [hypotheses[0][1] if hypotheses else [] for hypotheses in finished]
+
 
 # Main Model
 class EnhancedSeq2SeqModel(nn.Module):
@@ -341,33 +575,364 @@ class EnhancedSeq2SeqModel(nn.Module):
             attention_dim=attention_dim
         )
 
-    def forward(self, src_ids, src_lengths, max_length=200):
+    def forward(self, src_ids, src_lengths, max_length=200, step_fn=None, candidates=None, max_lengths=None):
         encoder_outputs, encoder_hidden, encoder_cell = self.encoder(src_ids, src_lengths)
-        decoder_outputs = self.decoder(encoder_outputs, encoder_hidden, encoder_cell, src_lengths, max_length)
+        decoder_outputs = self.decoder(
+            encoder_outputs, encoder_hidden, encoder_cell, src_lengths, max_length,
+            step_fn=step_fn, candidates=candidates, max_lengths=max_lengths
+        )
         return decoder_outputs
 
+    def greedy_decode(self, src_ids, src_lengths, max_length=200, step_fn=None, candidates=None,
+                      return_log_probs=False, max_lengths=None):
+        encoder_outputs, encoder_hidden, encoder_cell = self.encoder(src_ids, src_lengths)
+        return self.decoder.greedy_decode(
+            encoder_outputs, encoder_hidden, encoder_cell, src_lengths, max_length=max_length,
+            step_fn=step_fn, candidates=candidates, return_log_probs=return_log_probs, max_lengths=max_lengths
+        )
+
+    def beam_search(self, src_ids, src_lengths, beam_size=4, max_length=200, length_penalty=1.0,
+                    step_fn=None, candidates=None, max_lengths=None):
+        encoder_outputs, encoder_hidden, encoder_cell = self.encoder(src_ids, src_lengths)
+        return self.decoder.beam_search(
+            encoder_outputs, encoder_hidden, encoder_cell, src_lengths,
+            beam_size=beam_size, max_length=max_length, length_penalty=length_penalty,
+            step_fn=step_fn, candidates=candidates, max_lengths=max_lengths
+        )
+
+
+def build_seq2seq_model(config, src_vocab_size, tgt_vocab_size):
+    """EnhancedSeq2SeqModel with the hyperparameters stored in a checkpoint config."""
+    return EnhancedSeq2SeqModel(
+        src_vocab_size=src_vocab_size,
+        tgt_vocab_size=tgt_vocab_size,
+        embedding_dim=config.get('embedding_dim', 512),
+        encoder_hidden_dim=config.get('encoder_hidden_dim', 512),
+        decoder_hidden_dim=config.get('decoder_hidden_dim', 512),
+        dropout=config.get('dropout', 0.1),
+        attention_dim=config.get('attention_dim', 256)
+    )
+
+
+def load_seq2seq_checkpoint(model_path, src_vocab_size, tgt_vocab_size, device, fast=True):
+    """Load a training checkpoint into an eval-mode model on ``device``.
+
+    The fast path memory-maps the file with ``weights_only=True``, builds the
+    model on the meta device (no random init) and assigns the mapped tensors
+    directly, so weights are paged in on demand and processes loading the
+    same file share the page cache. Old non-zip checkpoints cannot be
+    memory-mapped and fall back to a regular ``torch.load``, still with
+    ``weights_only=True``, into a normally initialized model. Checkpoints
+    that carry pickled non-tensor objects are rejected either way.
+
+    Returns (model, checkpoint, fast_path_used).
+    """
+    if fast:
+        try:
+            checkpoint = torch.load(model_path, map_location='cpu', mmap=True, weights_only=True)
+        except RuntimeError as e:
+            # Raised for legacy (pre-zipfile) checkpoints; anything else is a real load error
+            if 'mmap' not in str(e):
+                raise
+            print(f"⚠️ Checkpoint cannot be memory-mapped ({e}), falling back to a regular load")
+        else:
+            config = checkpoint.get('config', {})
+            with torch.device('meta'):
+                model = build_seq2seq_model(config, src_vocab_size, tgt_vocab_size)
+            model.load_state_dict(checkpoint['model_state_dict'], assign=True)
+
+            if not any(tensor.is_meta for tensor in list(model.parameters()) + list(model.buffers())):
+                return model.to(device).eval(), checkpoint, True
+            print("⚠️ Checkpoint does not cover every model tensor, falling back to a regular load")
+
+    checkpoint = torch.load(model_path, map_location=device, weights_only=True)
+    model = build_seq2seq_model(checkpoint.get('config', {}), src_vocab_size, tgt_vocab_size).to(device)
+    model.load_state_dict(checkpoint['model_state_dict'])
+    return model.eval(), checkpoint, False
+
+
+def model_size_bytes(model):
+    """Bytes held by a model's state-dict tensors, without serializing them.
+
+    Dynamically quantized modules store packed weights as tuples (Linear) or
+    TorchScript objects (LSTM, LSTMCell); these are unpacked to their tensors.
+    """
+    def tensor_bytes(value):
+        if isinstance(value, torch.Tensor):
+            return value.numel() * value.element_size()
+        if isinstance(value, (tuple, list)):
+            return sum(tensor_bytes(item) for item in value)
+        if isinstance(value, torch.ScriptObject) and hasattr(value, '__getstate__'):
+            return tensor_bytes(value.__getstate__())
+        return 0
+
+    return sum(tensor_bytes(value) for value in model.state_dict().values())
+
+
+class LexicalShortlist:
+    """Candidate target vocabulary for a batch, built from its source pieces.
+
+    Loaded from the JSON written by scripts/build_shortlist.py: the top
+    co-occurring Roman pieces of every Urdu piece plus always-on frequent
+    pieces (special tokens are always included).
+    """
+
+    def __init__(self, path):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+
+        self.always = sorted(set(data['frequent']) | {0, 1, 2, 3})
+        self.table = {int(src_id): tgt_ids for src_id, tgt_ids in data['table'].items()}
+
+    def candidates(self, src_sequences, device):
+        """Sorted candidate id tensor covering every source sequence in a batch."""
+        ids = set(self.always)
+        for src_ids in src_sequences:
+            for src_id in src_ids:
+                ids.update(self.table.get(src_id, ()))
+        return torch.tensor(sorted(ids), dtype=torch.long, device=device)
+
+
+class TranslationCache:
+    """Thread-safe LRU cache of finished translations.
+
+    Bounded both by entry count and by an estimate of the memory held by
+    keys and values; the least recently used entries are evicted first.
+    """
+
+    def __init__(self, max_entries=10000, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _entry_size(key, value):
+        """Approximate memory held by one entry."""
+        return sys.getsizeof(key) + sum(sys.getsizeof(part) for part in key) + sys.getsizeof(value)
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """Insert or refresh an entry, evicting old entries to stay in bounds."""
+        size = self._entry_size(key, value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+
+            while len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __bool__(self):
+        # An empty cache is still a cache; without this `if cache:` would skip it
+        return True
+
+    def stats(self):
+        """Return a snapshot of cache counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
 
 class UrduRomanTranslator:
     """Main translator class for deployment."""
 
-    def __init__(self, model_path='best_attention_model.pth'):
+    def __init__(self, model_path='best_attention_model.pth', cache_size=10000,
+                 cache_max_bytes=64 * 1024 * 1024, quantize=None, compile_decoder=None, shortlist_path=None,
+                 metrics=None, fast_load=None, warmup=None, cpu_profile=None, decode_budget=None):
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+
+        # Thread counts tuned by scripts/autotune_cpu.py (cpu_profile=False leaves torch's defaults)
+        self.cpu_profile = None
+        if cpu_profile is not False and self.device.type == 'cpu':
+            self.cpu_profile = load_cpu_profile(cpu_profile)
+            if self.cpu_profile:
+                threads = apply_thread_settings(self.cpu_profile)
+                print(f"   CPU profile: {threads} intra-op / "
+                      f"{self.cpu_profile['inter_op_threads']} inter-op threads")
         self.model = None
         self.src_tokenizer = None
         self.tgt_tokenizer = None
         self.config = None
         self.best_bleu = 0
+        self.load_time = 0.0
 
-        # Session statistics
-        self.session_stats = {
-            'total_translations': 0,
-            'avg_translation_time': 0,
-            'total_characters_processed': 0
-        }
+        # Memory-mapped, weights-only checkpoint loading (on by default, falls back to torch.load)
+        if fast_load is None:
+            fast_load = os.environ.get('URDU_TRANSLATOR_FAST_LOAD', '1').lower() not in ('0', 'false', 'no')
+        self.fast_load = fast_load
+
+        # Readiness: cleared while warming up, set once requests run at steady-state speed.
+        # With warmup enabled the constructor returns at once and warm-up runs in the background.
+        self._ready = threading.Event()
+        self.warmup_report = {}
+        if warmup is None:
+            warmup = os.environ.get('URDU_TRANSLATOR_WARMUP', '').lower() in ('1', 'true', 'yes')
+
+        # Dynamic int8 quantization (opt-in, CPU only)
+        if quantize is None:
+            quantize = os.environ.get('URDU_TRANSLATOR_QUANTIZE', '').lower() in ('1', 'true', 'yes')
+        self.quantized = False
+        self.model_footprint = {}
+
+        # TorchScript decoder step (opt-in, falls back to eager mode)
+        if compile_decoder is None:
+            compile_decoder = os.environ.get('URDU_TRANSLATOR_JIT', '').lower() in ('1', 'true', 'yes')
+        self.decoder_step = None
+
+        # Lexical shortlist for the output projection (opt-in)
+        shortlist_path = shortlist_path or os.environ.get('URDU_TRANSLATOR_SHORTLIST')
+        self.shortlist = LexicalShortlist(shortlist_path) if shortlist_path else None
+
+        # Source-length-adaptive decode budget (decode_budget=False decodes up to max_length)
+        self.decode_budget = resolve_decode_budget(decode_budget)
+
+        # Translation cache (disabled with cache_size=0)
+        self.cache = TranslationCache(cache_size, cache_max_bytes) if cache_size > 0 else None
+
+        # Session statistics (thread-safe; read through session_stats)
+        self.translation_stats = TranslationStats()
+
+        # Prometheus counters/histograms (see metrics.py); shared process-wide by default
+        self.metrics = metrics or default_translator_metrics()
 
         # Load model and tokenizers
         self._load_model(model_path)
 
+        if quantize:
+            self._quantize_model()
+
+        if compile_decoder:
+            self.decoder_step = DecoderStepEngine(self.model.decoder)
+            print(f"   Decoder step: {self.decoder_step.mode}")
+
+        if warmup:
+            self.start_warmup()
+        else:
+            self._ready.set()
+
+    @property
+    def is_ready(self):
+        """True once the model is loaded and any warm-up has finished."""
+        return self._ready.is_set()
+
+    def wait_until_ready(self, timeout=None):
+        """Block until is_ready (or the timeout passes); returns is_ready."""
+        return self._ready.wait(timeout)
+
+    def start_warmup(self, **kwargs):
+        """Run warmup(**kwargs) on a daemon thread; is_ready is False until it finishes."""
+        self._ready.clear()
+        thread = threading.Thread(target=self.warmup, kwargs=kwargs, name='translator-warmup', daemon=True)
+        thread.start()
+        return thread
+
+    def warmup(self, src_lengths=(8, 32, 96), batch_sizes=(1, 8, 32), beam_sizes=(1,), max_length=32):
+        """Run synthetic batches so the first real request runs at steady-state speed.
+
+        Every source length x batch size x beam size combination goes through
+        the same encoder/decoder path as real traffic, which creates oneDNN
+        primitives, grows the allocator and compiles the TorchScript step;
+        both tokenizers are touched once per length. The cache, session
+        stats and metrics are left untouched. Readiness is cleared while it
+        runs. Returns (and stores in warmup_report) the per-batch timings.
+        """
+        if not self.model or not self.src_tokenizer or not self.tgt_tokenizer:
+            self._ready.set()
+            return {}
+
+        self._ready.clear()
+        generator = torch.Generator().manual_seed(0)
+        vocab_size = self.src_tokenizer.get_vocab_size('level0')
+        runs = []
+        start = time.perf_counter()
+
+        try:
+            self.model.eval()
+            with torch.no_grad():
+                for src_len in src_lengths:
+                    pieces = torch.randint(4, vocab_size, (src_len,), generator=generator).tolist()
+                    text = self.src_tokenizer.decode_multilevel(pieces)
+                    self.src_tokenizer.encode_multilevel(text)
+                    src_row = [3] + pieces + [1]  # BOS + pieces + EOS
+
+                    for batch_size in batch_sizes:
+                        src_ids = torch.tensor([src_row] * batch_size).to(self.device)
+                        src_lengths_tensor = torch.full((batch_size,), len(src_row), dtype=torch.long).to(self.device)
+                        candidates = self._shortlist_candidates([src_row] * batch_size)
+
+                        for beam_size in beam_sizes:
+                            run_start = time.perf_counter()
+                            if beam_size > 1:
+                                pred_tokens = self.model.beam_search(
+                                    src_ids, src_lengths_tensor, beam_size=beam_size, max_length=max_length,
+                                    step_fn=self.decoder_step, candidates=candidates
+                                )
+                            else:
+                                pred_tokens = self.model.greedy_decode(
+                                    src_ids, src_lengths_tensor, max_length=max_length,
+                                    step_fn=self.decoder_step, candidates=candidates
+                                ).tolist()
+                            for tokens in pred_tokens:
+                                self._tokens_to_text(tokens)
+
+                            runs.append({
+                                'src_len': len(src_row),
+                                'batch_size': batch_size,
+                                'beam_size': beam_size,
+                                'seconds': time.perf_counter() - run_start
+                            })
+
+        except Exception as e:
+            print(f"⚠️ Warm-up failed: {e}")
+
+        finally:
+            self.warmup_report = {'total_seconds': time.perf_counter() - start, 'runs': runs}
+            self._ready.set()
+
+        if runs:
+            print(f"✅ Warm-up: {len(runs)} batches in {self.warmup_report['total_seconds']:.2f}s "
+                  f"(first {runs[0]['seconds'] * 1000:.0f} ms, last {runs[-1]['seconds'] * 1000:.0f} ms)")
+        return self.warmup_report
+
     def _load_model(self, model_path):
         """Load the trained model and tokenizers."""
         try:
@@ -386,32 +951,20 @@ class UrduRomanTranslator:
 
             # Load model checkpoint
             if os.path.exists(model_path):
-                checkpoint = torch.load(model_path, map_location=self.device)
-
-                # Get configuration
-                self.config = checkpoint.get('config', {})
-                self.best_bleu = checkpoint.get('best_bleu', 0)
-
-                # Create model with loaded vocab sizes
                 src_vocab_size = self.src_tokenizer.get_vocab_size('level0')
                 tgt_vocab_size = self.tgt_tokenizer.get_vocab_size('level0')
 
-                self.model = EnhancedSeq2SeqModel(
-                    src_vocab_size=src_vocab_size,
-                    tgt_vocab_size=tgt_vocab_size,
-                    embedding_dim=self.config.get('embedding_dim', 512),
-                    encoder_hidden_dim=self.config.get('encoder_hidden_dim', 512),
-                    decoder_hidden_dim=self.config.get('decoder_hidden_dim', 512),
-                    dropout=self.config.get('dropout', 0.1),
-                    attention_dim=self.config.get('attention_dim', 256)
-                ).to(self.device)
-
-                # Load trained weights
-                self.model.load_state_dict(checkpoint['model_state_dict'])
-                self.model.eval()
+                load_start = time.perf_counter()
+                self.model, checkpoint, fast = load_seq2seq_checkpoint(
+                    model_path, src_vocab_size, tgt_vocab_size, self.device, fast=self.fast_load
+                )
+                self.config = checkpoint.get('config', {})
+                self.best_bleu = checkpoint.get('best_bleu', 0)
+                self.load_time = time.perf_counter() - load_start
 
                 print(f"✅ Model loaded successfully!")
                 print(f"   BLEU Score: {self.best_bleu:.2f}")
+                print(f"   Load: {self.load_time:.2f}s ({'mmap, weights only' if fast else 'weights only'})")
                 print(f"   Device: {self.device}")
                 print(f"   Urdu Vocab: {src_vocab_size:,}")
                 print(f"   Roman Vocab: {tgt_vocab_size:,}")
@@ -423,57 +976,462 @@ class UrduRomanTranslator:
             print(f"❌ Error loading model: {e}")
             raise e
 
-    def translate(self, urdu_text, max_length=200):
-        """Translate Urdu text to Roman Urdu."""
+    def _quantize_model(self):
+        """Swap the model for a dynamically int8-quantized copy.
+
+        LSTM, LSTMCell and Linear weights are stored as int8 and activations
+        are quantized on the fly; embeddings and LayerNorms stay fp32.
+        """
+        if self.device.type != 'cpu':
+            print(f"⚠️ Quantized mode is CPU-only, keeping fp32 model on {self.device}")
+            return
+
+        fp32_bytes = model_size_bytes(self.model)
+        self.model = torch.ao.quantization.quantize_dynamic(
+            self.model, {nn.LSTM, nn.LSTMCell, nn.Linear}, dtype=torch.qint8
+        )
+        self.model.eval()
+        int8_bytes = model_size_bytes(self.model)
+
+        self.quantized = True
+        self.model_footprint = {'fp32_bytes': fp32_bytes, 'int8_bytes': int8_bytes}
+
+        print("✅ Dynamic int8 quantization enabled")
+        print(f"   Model size: {fp32_bytes / 1e6:.1f} MB -> {int8_bytes / 1e6:.1f} MB "
+              f"({fp32_bytes / int8_bytes:.1f}x smaller)")
+
+    def translate(self, urdu_text, max_length=200, beam_size=1, profile=False):
+        """Translate Urdu text to Roman Urdu.
+
+        Returns (translation, translation_time). With ``profile=True`` a third
+        element holds the per-stage breakdown: seconds spent in clean,
+        cache_lookup, tokenize, encode, decode and detokenize, plus the number
+        of decoder steps.
+        """
         if not self.model or not self.src_tokenizer or not self.tgt_tokenizer:
-            return "Error: Model not loaded properly", 0
+            self.metrics.record_error('not_loaded')
+            return ("Error: Model not loaded properly", 0) + (({},) if profile else ())
 
         start_time = time.time()
+        timer = StageTimer(self.device) if profile else None
+
+        def result(translation, translation_time):
+            if timer is None:
+                return translation, translation_time
+            return translation, translation_time, timer.as_dict()
 
         try:
             # Clean input text
             cleaned_text = ultra_clean_urdu(urdu_text.strip())
+            if timer:
+                timer.mark('clean')
 
             if not cleaned_text:
-                return "Error: Empty or invalid text", 0
+                self.metrics.record_error('empty')
+                return result("Error: Empty or invalid text", 0)
+
+            # Serve repeated inputs from the cache
+            cache_key = self._cache_key(cleaned_text, max_length, beam_size)
+            translation = self._cache_lookup(cache_key)
+            if timer:
+                timer.mark('cache_lookup')
+            if translation is not None:
+                translation_time = time.time() - start_time
+                self._update_stats(urdu_text, translation_time, timer)
+                return result(translation, translation_time)
 
             # Encode source text
             src_encodings = self.src_tokenizer.encode_multilevel(cleaned_text)
             src_ids = torch.tensor([src_encodings['level0']]).to(self.device)
             src_lengths = torch.tensor([len(src_encodings['level0'])]).to(self.device)
+            if timer:
+                timer.mark('tokenize')
 
             # Generate translation
-            self.model.eval()
-            with torch.no_grad():
-                outputs = self.model(src_ids, src_lengths, max_length=max_length)
-                pred_tokens = outputs[0].argmax(dim=-1).cpu().numpy()
+            pred_tokens = self._generate(src_ids, src_lengths, max_length, beam_size, timer)[0]
 
             # Decode output
-            pred_tokens_clean = [int(t) for t in pred_tokens if t not in [0, 1, 2, 3]]
-            translation = self.tgt_tokenizer.decode_multilevel(pred_tokens_clean, 'level0').strip()
-
-            if not translation:
-                translation = "Translation unavailable"
+            translation = self._tokens_to_text(pred_tokens)
+            if self.cache is not None:
+                self.cache.put(cache_key, translation)
+            if timer:
+                timer.mark('detokenize')
 
             translation_time = time.time() - start_time
 
             # Update statistics
+            self._update_stats(urdu_text, translation_time, timer, self._output_length(pred_tokens))
+
+            return result(translation, translation_time)
+
+        except Exception as e:
+            print(f"Translation error: {e}")
+            self.metrics.record_error('failed')
+            return result(f"Error: Translation failed - {str(e)}", time.time() - start_time)
+
+    def translate_stream(self, urdu_text, max_length=200):
+        """Translate with greedy decoding, yielding partial output as words complete.
+
+        Yields (partial_translation, elapsed_time) tuples, each ending on a
+        finished word; the last tuple is the full translation. Multi-sentence
+        input is handed to translate_document and yielded once.
+        """
+        if not self.model or not self.src_tokenizer or not self.tgt_tokenizer:
+            self.metrics.record_error('not_loaded')
+            yield "Error: Model not loaded properly", 0
+            return
+
+        start_time = time.time()
+        cleaned_text = ultra_clean_urdu(urdu_text.strip())
+
+        if not cleaned_text:
+            self.metrics.record_error('empty')
+            yield "Error: Empty or invalid text", 0
+            return
+
+        segments = split_urdu_sentences(urdu_text)[0::2]
+        if sum(1 for segment in segments if ultra_clean_urdu(segment)) > 1:
+            yield self.translate_document(urdu_text, max_length=max_length)
+            return
+
+        cache_key = self._cache_key(cleaned_text, max_length)
+        translation = self._cache_lookup(cache_key)
+        if translation is not None:
+            translation_time = time.time() - start_time
             self._update_stats(urdu_text, translation_time)
+            yield translation, translation_time
+            return
 
-            return translation, translation_time
+        pred_tokens = []
+        try:
+            src_encodings = self.src_tokenizer.encode_multilevel(cleaned_text)
+            src_ids = torch.tensor([src_encodings['level0']]).to(self.device)
+            src_lengths = torch.tensor([len(src_encodings['level0'])]).to(self.device)
+
+            # Grad mode is set per step so it never leaks to the caller between yields
+            decoder = self.model.decoder
+            self.model.eval()
+            candidates = self._shortlist_candidates([src_encodings['level0']])
+            with torch.no_grad():
+                encoder_outputs, encoder_hidden, encoder_cell = self.model.encoder(src_ids, src_lengths)
+
+            budget = max_length
+            if self.decode_budget:
+                budget = self.decode_budget.step_budget(len(src_encodings['level0']), max_length)
+            steps = decoder.greedy_steps(
+                encoder_outputs, encoder_hidden, encoder_cell, src_lengths, max_length=budget,
+                step_fn=self.decoder_step, candidates=candidates
+            )
+            emitted = ""
+            hit_budget = True
+
+            while True:
+                with torch.no_grad():
+                    step = next(steps, None)
+                if step is None:
+                    break
+
+                token = step[3].item()
+                if token == 1:  # EOS token
+                    hit_budget = False
+                    break
+
+                # A piece that starts a new word completes the previous one
+                if pred_tokens and self.tgt_tokenizer.is_word_start(token):
+                    partial = self.tgt_tokenizer.decode_multilevel(
+                        [t for t in pred_tokens if t not in [0, 1, 2, 3]], 'level0'
+                    ).strip()
+                    if partial and partial != emitted:
+                        emitted = partial
+                        yield partial, time.time() - start_time
+
+                pred_tokens.append(token)
 
         except Exception as e:
             print(f"Translation error: {e}")
-            return f"Error: Translation failed - {str(e)}", time.time() - start_time
+            self.metrics.record_error('failed')
+            yield f"Error: Translation failed - {str(e)}", time.time() - start_time
+            return
+
+        translation = self._tokens_to_text(pred_tokens)
+        if self.cache is not None:
+            self.cache.put(cache_key, translation)
+
+        self.metrics.batch_size.observe(1)
+        self.metrics.decoder_steps.observe(len(pred_tokens) + (0 if hit_budget else 1))
+        self._record_budget(1, int(hit_budget))
+        translation_time = time.time() - start_time
+        self._update_stats(urdu_text, translation_time, output_tokens=len(pred_tokens))
+
+        yield translation, translation_time
+
+    def translate_batch(self, urdu_texts, max_length=200, batch_size=32, beam_size=1, profile=False):
+        """Translate a list of Urdu texts, batching inputs of similar length.
+
+        Returns a list of (translation, translation_time) tuples in input order.
+        Each item's time is its own cleaning/tokenization time plus an equal
+        share of its bucket's model time. With ``profile=True`` each tuple
+        gets a third element, the stage breakdown described in ``translate``;
+        bucket stages are shared the same way and decoder_steps counts the
+        steps run for the item's bucket.
+        """
+        if not self.model or not self.src_tokenizer or not self.tgt_tokenizer:
+            self.metrics.record_error('not_loaded', len(urdu_texts))
+            error = ("Error: Model not loaded properly", 0) + (({},) if profile else ())
+            return [error for _ in urdu_texts]
+
+        empty = ("Error: Empty or invalid text", 0) + (({},) if profile else ())
+        results = [None] * len(urdu_texts)
+        pending = []  # (input index, source ids, preprocessing time, cache key, timer)
+        pending_keys = {}  # cache key -> position in pending
+        duplicates = []  # (input index, position in pending)
+
+        # Clean and tokenize every input up front, resolving cache hits
+        for index, urdu_text in enumerate(urdu_texts):
+            start_time = time.time()
+            timer = StageTimer(self.device) if profile else None
+            cleaned_text = ultra_clean_urdu(urdu_text.strip()) if isinstance(urdu_text, str) else ""
+            if timer:
+                timer.mark('clean')
 
-    def _update_stats(self, input_text, translation_time):
-        """Update session statistics."""
-        self.session_stats['total_translations'] += 1
-        self.session_stats['total_characters_processed'] += len(input_text)
+            if not cleaned_text:
+                self.metrics.record_error('empty')
+                results[index] = empty
+                continue
+
+            cache_key = self._cache_key(cleaned_text, max_length, beam_size)
+            if cache_key in pending_keys:
+                duplicates.append((index, pending_keys[cache_key]))
+                continue
+
+            translation = self._cache_lookup(cache_key)
+            if timer:
+                timer.mark('cache_lookup')
+            if translation is not None:
+                translation_time = time.time() - start_time
+                self._update_stats(urdu_text, translation_time, timer)
+                results[index] = (translation, translation_time) + ((timer.as_dict(),) if timer else ())
+                continue
+
+            src_ids = self.src_tokenizer.encode_multilevel(cleaned_text)['level0']
+            if timer:
+                timer.mark('tokenize')
+            pending_keys[cache_key] = len(pending)
+            pending.append((index, src_ids, time.time() - start_time, cache_key, timer))
+
+        # One encoder/decoder pass per length bucket
+        for bucket in length_buckets([len(item[1]) for item in pending], batch_size):
+            items = [pending[i] for i in bucket]
+            bucket_start = time.time()
+            bucket_timer = StageTimer(self.device) if profile else None
+
+            try:
+                src_ids = pad_sequence(
+                    [torch.tensor(item[1]) for item in items], batch_first=True, padding_value=0
+                ).to(self.device)
+                src_lengths = torch.tensor([len(item[1]) for item in items]).to(self.device)
+                if bucket_timer:
+                    bucket_timer.mark('tokenize')
+
+                pred_tokens = self._generate(src_ids, src_lengths, max_length, beam_size, bucket_timer)
+                translations = [self._tokens_to_text(tokens) for tokens in pred_tokens]
+                if bucket_timer:
+                    bucket_timer.mark('detokenize')
+                shared_time = (time.time() - bucket_start) / len(items)
+
+                for (index, _, prep_time, cache_key, timer), translation, tokens in zip(
+                        items, translations, pred_tokens):
+                    translation_time = prep_time + shared_time
+                    if timer:
+                        timer.merge(bucket_timer, share=len(items))
+                    self._update_stats(urdu_texts[index], translation_time, timer, self._output_length(tokens))
+                    results[index] = (translation, translation_time) + ((timer.as_dict(),) if timer else ())
+                    if self.cache is not None:
+                        self.cache.put(cache_key, translation)
+
+            except Exception as e:
+                print(f"Batch translation error: {e}")
+                self.metrics.record_error('failed', len(items))
+                elapsed = time.time() - bucket_start
+                for index, _, prep_time, _, timer in items:
+                    results[index] = (f"Error: Translation failed - {str(e)}", prep_time + elapsed) + (
+                        (timer.as_dict(),) if timer else ()
+                    )
+
+        # Repeated inputs within the batch share the first occurrence's result
+        for index, position in duplicates:
+            result = results[pending[position][0]]
+            if result[0].startswith("Error:"):
+                self.metrics.record_error('failed')
+            else:
+                self._update_stats(urdu_texts[index], result[1])
+            results[index] = result
+
+        return results
+
+    def translate_document(self, urdu_text, max_length=200, beam_size=1, batch_size=32):
+        """Translate a multi-sentence text as one batch of sentences.
+
+        The text is split on sentence boundaries, the segments are translated
+        together with translate_batch (max_length applies per sentence), and
+        the result is reassembled with the original spacing and line breaks.
+        Sentence-final punctuation is written in its Roman form.
+        """
+        start_time = time.time()
+        parts = split_urdu_sentences(urdu_text)
+        segments, boundaries = parts[0::2], parts[1::2]
 
-        if self.session_stats['avg_translation_time'] == 0:
-            self.session_stats['avg_translation_time'] = translation_time
+        # A single sentence goes through the regular path unchanged
+        translatable = [i for i, segment in enumerate(segments) if ultra_clean_urdu(segment)]
+        if len(translatable) <= 1:
+            return self.translate(urdu_text, max_length=max_length, beam_size=beam_size)
+
+        results = self.translate_batch(
+            [segments[i] for i in translatable], max_length=max_length,
+            batch_size=batch_size, beam_size=beam_size
+        )
+
+        translated = {}
+        for i, (translation, _) in zip(translatable, results):
+            if translation.startswith("Error:"):
+                return translation, time.time() - start_time
+            translated[i] = translation.rstrip(' .?')
+
+        # Reassemble with the original whitespace around each segment
+        output = []
+        for i, segment in enumerate(segments):
+            if i in translated:
+                leading = segment[:len(segment) - len(segment.lstrip())]
+                trailing = segment[len(segment.rstrip()):]
+                output.append(leading + translated[i] + trailing)
+            else:
+                output.append(segment)
+
+            if i < len(boundaries):
+                output.append(romanize_boundary(boundaries[i]))
+
+        return ''.join(output), time.time() - start_time
+
+    @staticmethod
+    def _cache_key(cleaned_text, max_length, beam_size=1):
+        """Cache key for a cleaned input and its decoding parameters."""
+        mode = 'greedy' if beam_size <= 1 else f'beam{beam_size}'
+        return cleaned_text, max_length, mode
+
+    def _generate(self, src_ids, src_lengths, max_length, beam_size=1, timer=None):
+        """Decode a padded source batch, returning predicted target ids per row.
+
+        Decoder steps and the batch size are recorded in the metrics. With a
+        StageTimer, encoder and decoder time are marked separately.
+        """
+        # Building the id lists syncs with the device, so only do it when a shortlist is loaded
+        candidates = None
+        if self.shortlist is not None:
+            candidates = self._shortlist_candidates(
+                [row[:length] for row, length in zip(src_ids.tolist(), src_lengths.tolist())]
+            )
+
+        decoder = self.model.decoder
+        base_step = self.decoder_step or decoder.forward_step
+        steps = 0
+        budgets = self.decode_budget.row_budgets(src_lengths, max_length) if self.decode_budget else None
+
+        def step_fn(*args, **kwargs):
+            nonlocal steps
+            steps += 1
+            return base_step(*args, **kwargs)
+
+        self.model.eval()
+        with torch.no_grad():
+            encoder_outputs, encoder_hidden, encoder_cell = self.model.encoder(src_ids, src_lengths)
+            if timer:
+                timer.mark('encode')
+
+            if beam_size > 1:
+                pred_tokens = decoder.beam_search(
+                    encoder_outputs, encoder_hidden, encoder_cell, src_lengths, beam_size=beam_size,
+                    max_length=max_length, step_fn=step_fn, candidates=candidates, max_lengths=budgets
+                )
+            else:
+                pred_tokens = decoder.greedy_decode(
+                    encoder_outputs, encoder_hidden, encoder_cell, src_lengths, max_length=max_length,
+                    step_fn=step_fn, candidates=candidates, max_lengths=budgets
+                ).tolist()
+
+        if timer:
+            timer.mark('decode')
+            timer.decoder_steps += steps
+        self.metrics.batch_size.observe(src_ids.size(0))
+        self.metrics.decoder_steps.observe(steps)
+
+        # Sequences that stopped at their budget (or max_length) rather than at EOS
+        limits = budgets.tolist() if budgets is not None else [max_length] * len(pred_tokens)
+        if beam_size > 1:
+            hits = sum(len(tokens) >= limit for tokens, limit in zip(pred_tokens, limits))
+        else:
+            hits = sum(1 not in tokens for tokens in pred_tokens)
+        self._record_budget(len(pred_tokens), hits)
+        return pred_tokens
+
+    def _record_budget(self, sequences, hits):
+        self.translation_stats.record_budget(sequences, hits)
+        self.metrics.decoded_sequences.inc(sequences)
+        self.metrics.budget_hits.inc(hits)
+
+    def _cache_lookup(self, cache_key):
+        """Cached translation for a key, or None; counts hits and misses."""
+        if self.cache is None:
+            return None
+        translation = self.cache.get(cache_key)
+        self.metrics.cache_lookups.inc(result='miss' if translation is None else 'hit')
+        return translation
+
+    @staticmethod
+    def _output_length(pred_tokens):
+        """Number of generated target tokens before the first EOS."""
+        return pred_tokens.index(1) if 1 in pred_tokens else len(pred_tokens)
+
+    def _shortlist_candidates(self, src_sequences):
+        """Candidate target ids for a batch, or None when no shortlist is loaded."""
+        if self.shortlist is None:
+            return None
+        return self.shortlist.candidates(src_sequences, self.device)
+
+    def _tokens_to_text(self, pred_tokens):
+        """Convert predicted target ids to text, stopping at the first EOS."""
+        if 1 in pred_tokens:
+            pred_tokens = pred_tokens[:pred_tokens.index(1)]
+
+        pred_tokens_clean = [int(t) for t in pred_tokens if t not in [0, 1, 2, 3]]
+        translation = self.tgt_tokenizer.decode_multilevel(pred_tokens_clean, 'level0').strip()
+
+        return translation if translation else "Translation unavailable"
+
+    @property
+    def session_stats(self):
+        """Snapshot of the session statistics (see TranslationStats.snapshot)."""
+        return self.translation_stats.snapshot()
+
+    def reset_stats(self):
+        """Clear the session statistics."""
+        self.translation_stats.reset()
+
+    def profile_summary(self):
+        """Mean seconds per stage and mean decoder steps over profiled requests."""
+        stats = self.translation_stats.snapshot()
+        return {key: stats[key] for key in ('profiled_translations', 'mean_stage_seconds', 'mean_decoder_steps')}
+
+    def _update_stats(self, input_text, translation_time, timer=None, output_tokens=0):
+        """Update session statistics and metrics for a successful translation."""
+        metrics = self.metrics
+        metrics.requests.inc(outcome='ok')
+        metrics.input_characters.inc(len(input_text))
+        metrics.output_tokens.inc(output_tokens)
+        metrics.latency.observe(translation_time)
+
+        if timer is None:
+            self.translation_stats.record(translation_time, len(input_text))
         else:
-            current_avg = self.session_stats['avg_translation_time']
-            new_avg = (current_avg + translation_time) / 2
-            self.session_stats['avg_translation_time'] = new_avg
\ No newline at end of file
+            self.translation_stats.record(translation_time, len(input_text), timer.stages, timer.decoder_steps)
+            for stage, seconds in timer.stages.items():
+                metrics.stage_time.observe(seconds, stage=stage)
\ No newline at end of file
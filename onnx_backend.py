@@ -0,0 +1,216 @@
+# onnx_backend.py - onnxruntime inference backend (no torch import needed)
+#
+# Expects the files written by `python -m scripts.export_onnx`:
+#     encoder.onnx, decoder_step.onnx, config.json and the two tokenizer models.
+
+import json
+import os
+import time
+
+import numpy as np
+
+from decode_budget import resolve_decode_budget
+from text_processing import SimplifiedMultiLevelTokenizer, ultra_clean_urdu, length_buckets
+from translation_stats import StageTimer, TranslationStats
+
+try:
+    import onnxruntime as ort
+except ImportError:  # optional dependency
+    ort = None
+
+
+class OnnxUrduRomanTranslator:
+    """Greedy Urdu to Roman Urdu translator running on onnxruntime.
+
+    Mirrors UrduRomanTranslator.translate / translate_batch, including
+    shrinking the active batch as rows emit EOS and the per-row decode
+    budget (``decode_budget`` as in UrduRomanTranslator).
+    """
+
+    def __init__(self, model_dir='onnx_model', num_threads=None, decode_budget=None):
+        if ort is None:
+            raise ImportError("onnxruntime is required for the ONNX backend: pip install onnxruntime")
+
+        self.device = 'cpu'
+        self.model_dir = model_dir
+
+        with open(os.path.join(model_dir, 'config.json'), encoding='utf-8') as f:
+            self.config = json.load(f)
+        self.best_bleu = self.config.get('best_bleu', 0)
+
+        # Tokenizers
+        self.src_tokenizer = SimplifiedMultiLevelTokenizer('urdu', vocab_sizes=[15000])
+        self.tgt_tokenizer = SimplifiedMultiLevelTokenizer('roman', vocab_sizes=[12000])
+        if not (self.src_tokenizer.load_pretrained(os.path.join(model_dir, 'urdu_level0.model'))
+                and self.tgt_tokenizer.load_pretrained(os.path.join(model_dir, 'roman_level0.model'))):
+            raise FileNotFoundError(f"Tokenizer model files not found in {model_dir}")
+
+        # ONNX sessions
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        providers = ['CPUExecutionProvider']
+        self.encoder = ort.InferenceSession(os.path.join(model_dir, 'encoder.onnx'), options, providers=providers)
+        self.decoder_step = ort.InferenceSession(
+            os.path.join(model_dir, 'decoder_step.onnx'), options, providers=providers
+        )
+
+        # Source-length-adaptive decode budget (decode_budget=False decodes up to max_length)
+        self.decode_budget = resolve_decode_budget(decode_budget)
+
+        self.translation_stats = TranslationStats()
+
+        print(f"✅ ONNX model loaded from {model_dir}")
+
+    def translate(self, urdu_text, max_length=200, beam_size=1, profile=False):
+        """Translate Urdu text to Roman Urdu; see UrduRomanTranslator.translate."""
+        return self.translate_batch(
+            [urdu_text], max_length=max_length, batch_size=1, beam_size=beam_size, profile=profile
+        )[0]
+
+    def translate_batch(self, urdu_texts, max_length=200, batch_size=32, beam_size=1, profile=False):
+        """Translate a list of Urdu texts; see UrduRomanTranslator.translate_batch.
+
+        With ``profile=True`` each tuple gets a third element with the clean,
+        tokenize, encode, decode and detokenize times and the decoder steps.
+        """
+        if beam_size > 1:
+            error = ("Error: Beam search is not supported by the ONNX backend", 0) + (({},) if profile else ())
+            return [error for _ in urdu_texts]
+
+        results = [None] * len(urdu_texts)
+        pending = []  # (input index, source ids, preprocessing time, timer)
+
+        for index, urdu_text in enumerate(urdu_texts):
+            start_time = time.time()
+            timer = StageTimer() if profile else None
+            cleaned_text = ultra_clean_urdu(urdu_text.strip()) if isinstance(urdu_text, str) else ""
+            if timer:
+                timer.mark('clean')
+
+            if not cleaned_text:
+                results[index] = ("Error: Empty or invalid text", 0) + (({},) if profile else ())
+                continue
+
+            src_ids = self.src_tokenizer.encode_multilevel(cleaned_text)['level0']
+            if timer:
+                timer.mark('tokenize')
+            pending.append((index, src_ids, time.time() - start_time, timer))
+
+        for bucket in length_buckets([len(item[1]) for item in pending], batch_size):
+            items = [pending[i] for i in bucket]
+            bucket_start = time.time()
+            bucket_timer = StageTimer() if profile else None
+
+            try:
+                pred_tokens = self._greedy_decode([item[1] for item in items], max_length, bucket_timer)
+                translations = [self._tokens_to_text(tokens) for tokens in pred_tokens]
+                if bucket_timer:
+                    bucket_timer.mark('detokenize')
+                shared_time = (time.time() - bucket_start) / len(items)
+
+                for (index, _, prep_time, timer), translation in zip(items, translations):
+                    translation_time = prep_time + shared_time
+                    if timer:
+                        timer.merge(bucket_timer, share=len(items))
+                    self._update_stats(urdu_texts[index], translation_time, timer)
+                    results[index] = (translation, translation_time) + ((timer.as_dict(),) if timer else ())
+
+            except Exception as e:
+                print(f"Batch translation error: {e}")
+                elapsed = time.time() - bucket_start
+                for index, _, prep_time, timer in items:
+                    results[index] = (f"Error: Translation failed - {str(e)}", prep_time + elapsed) + (
+                        (timer.as_dict(),) if timer else ()
+                    )
+
+        return results
+
+    def _greedy_decode(self, sequences, max_length, timer=None):
+        """Run the encoder once and the decoder step until every row emits EOS or reaches its budget."""
+        batch_size = len(sequences)
+        src_lengths = np.array([len(ids) for ids in sequences], dtype=np.int64)
+        if self.decode_budget:
+            row_budgets = np.array([self.decode_budget.step_budget(len(ids), max_length) for ids in sequences])
+        else:
+            row_budgets = np.full(batch_size, max_length)
+        src_ids = np.zeros((batch_size, src_lengths.max()), dtype=np.int64)
+        for row, ids in enumerate(sequences):
+            src_ids[row, :len(ids)] = ids
+
+        encoder_outputs, keys, hidden, cell = self.encoder.run(
+            None, {'src_ids': src_ids, 'src_lengths': src_lengths}
+        )
+        pad_mask = np.arange(encoder_outputs.shape[1])[None, :] >= src_lengths[:, None]
+        if timer:
+            timer.mark('encode')
+
+        token_ids = np.zeros((batch_size, max_length), dtype=np.int64)
+        active_rows = np.arange(batch_size)
+        input_token = np.full(batch_size, 3, dtype=np.int64)  # BOS token
+        steps = 0
+
+        for step in range(int(row_budgets.max())):
+            logits, hidden, cell = self.decoder_step.run(None, {
+                'input_token': input_token, 'hidden': hidden, 'cell': cell,
+                'encoder_outputs': encoder_outputs, 'keys': keys, 'pad_mask': pad_mask
+            })
+            input_token = logits.argmax(axis=1)
+            token_ids[active_rows, step] = input_token
+            steps = step + 1
+
+            # Drop rows that emitted EOS or used up their step budget
+            finished = (input_token == 1) | (row_budgets <= step + 1)
+            if finished.all():
+                break
+
+            if finished.any():
+                keep = ~finished
+                active_rows = active_rows[keep]
+                input_token = input_token[keep]
+                row_budgets = row_budgets[keep]
+                hidden, cell = hidden[:, keep], cell[:, keep]
+                src_lengths = src_lengths[keep]
+                src_seq_len = int(src_lengths.max())
+                encoder_outputs = encoder_outputs[keep, :src_seq_len]
+                keys = keys[keep, :src_seq_len]
+                pad_mask = pad_mask[keep, :src_seq_len]
+
+        if timer:
+            timer.mark('decode')
+            timer.decoder_steps += steps
+        pred_tokens = token_ids.tolist()
+        self.translation_stats.record_budget(len(pred_tokens), sum(1 not in tokens for tokens in pred_tokens))
+        return pred_tokens
+
+    def _tokens_to_text(self, pred_tokens):
+        """Convert predicted target ids to text, stopping at the first EOS."""
+        if 1 in pred_tokens:
+            pred_tokens = pred_tokens[:pred_tokens.index(1)]
+
+        pred_tokens_clean = [int(t) for t in pred_tokens if t not in [0, 1, 2, 3]]
+        translation = self.tgt_tokenizer.decode_multilevel(pred_tokens_clean, 'level0').strip()
+
+        return translation if translation else "Translation unavailable"
+
+    @property
+    def session_stats(self):
+        """Snapshot of the session statistics (see TranslationStats.snapshot)."""
+        return self.translation_stats.snapshot()
+
+    def profile_summary(self):
+        """Mean seconds per stage and mean decoder steps over profiled requests."""
+        stats = self.translation_stats.snapshot()
+        return {key: stats[key] for key in ('profiled_translations', 'mean_stage_seconds', 'mean_decoder_steps')}
+
+    def reset_stats(self):
+        """Clear the session statistics."""
+        self.translation_stats.reset()
+
+    def _update_stats(self, input_text, translation_time, timer=None):
+        """Update session statistics."""
+        if timer is None:
+            self.translation_stats.record(translation_time, len(input_text))
+        else:
+            self.translation_stats.record(translation_time, len(input_text), timer.stages, timer.decoder_steps)
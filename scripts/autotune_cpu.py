@@ -0,0 +1,198 @@
+# autotune_cpu.py - Pick torch thread counts and a worker layout for this machine
+#
+# Run from the repository root (random weights with the deployed shapes):
+#     python -m scripts.autotune_cpu
+#     python -m scripts.autotune_cpu --latency-slo-ms 250 --output cpu_profile.json
+#
+# Phase 1 times greedy decoding in one process for every thread count x batch
+# size and keeps the thread count with the best single-request (batch 1)
+# latency as single_process_threads.
+# Phase 2 runs N pinned processes side by side (cores split evenly, as in
+# server.py) for every process count x batch size. It keeps the layout with
+# the highest aggregate throughput whose p95 batch latency meets
+# --latency-slo-ms, which server.py uses for --workers/--threads/--max-batch.
+# Every measurement runs in a fresh process.
+#
+# UrduRomanTranslator applies the layout's per-worker share (intra_op_threads)
+# at construction, so standalone processes sharing the machine do not
+# oversubscribe it; see cpu_profile.py and $URDU_TRANSLATOR_PROCESSES.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+
+def available_cores():
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def powers_of_two_up_to(limit):
+    values, value = [], 1
+    while value < limit:
+        values.append(value)
+        value *= 2
+    return values + [limit]
+
+
+def run_child(config):
+    """Child process: pin, set threads, then time greedy decoding; print durations as JSON."""
+    if config['cores'] and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, config['cores'])
+
+    import torch
+    torch.set_num_threads(config['threads'])
+    torch.set_interop_threads(1)
+
+    from benchmarks.common import build_random_model, random_source_batch
+
+    model = build_random_model()
+    src_ids, src_lengths = random_source_batch(config['batch_size'], config['src_len'])
+
+    durations = []
+    with torch.no_grad():
+        for i in range(config['warmup'] + config['iterations']):
+            start = time.perf_counter()
+            model.greedy_decode(src_ids, src_lengths, max_length=config['decode_steps'])
+            if i >= config['warmup']:
+                durations.append(time.perf_counter() - start)
+    print(json.dumps(durations))
+
+
+def measure(processes, threads, batch_size, cores, args):
+    """Run ``processes`` pinned children at once; return throughput and latency percentiles."""
+    from benchmarks.common import latency_summary
+
+    per_process = max(len(cores) // processes, 1)
+    children = []
+    start = time.perf_counter()
+    for i in range(processes):
+        config = {
+            'cores': cores[(i * per_process) % len(cores):][:per_process] if processes > 1 else cores,
+            'threads': threads, 'batch_size': batch_size, 'src_len': args.src_len,
+            'decode_steps': args.decode_steps, 'warmup': args.warmup, 'iterations': args.iterations
+        }
+        children.append(subprocess.Popen(
+            [sys.executable, '-m', 'scripts.autotune_cpu', '--child', json.dumps(config)],
+            stdout=subprocess.PIPE, text=True
+        ))
+
+    durations = []
+    for child in children:
+        output, _ = child.communicate()
+        if child.returncode != 0:
+            raise RuntimeError(f"benchmark process failed with status {child.returncode}")
+        durations.extend(json.loads(output.strip().splitlines()[-1]))
+    wall_time = time.perf_counter() - start
+
+    summary = latency_summary(durations)
+    busy_time = sum(durations) / processes  # per-process decode time, excluding start-up
+    return {
+        'processes': processes,
+        'threads': threads,
+        'batch_size': batch_size,
+        'sentences_per_s': processes * batch_size * args.iterations / busy_time,
+        'wall_seconds': wall_time,
+        **summary
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Autotune CPU threading for the translator")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8, 16, 32])
+    parser.add_argument('--threads', type=int, nargs='+', default=None,
+                        help="Thread counts for phase 1 (default: powers of two up to the core count)")
+    parser.add_argument('--processes', type=int, nargs='+', default=None,
+                        help="Process counts for phase 2 (default: powers of two up to the core count)")
+    parser.add_argument('--src-len', type=int, default=30)
+    parser.add_argument('--decode-steps', type=int, default=40)
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--latency-slo-ms', type=float, default=None,
+                        help="Maximum p95 batch latency for the chosen server layout")
+    parser.add_argument('--output', default='cpu_profile.json')
+    parser.add_argument('--child', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(json.loads(args.child))
+        return
+
+    cores = available_cores()
+    print(f"Tuning on {len(cores)} cores ({platform.processor() or platform.machine()})")
+
+    # Phase 1: threads x batch size in one process
+    single_process = []
+    for threads in args.threads or powers_of_two_up_to(len(cores)):
+        for batch_size in args.batch_sizes:
+            result = measure(1, threads, batch_size, cores, args)
+            single_process.append(result)
+            print(f"  1 process  x {threads:>2} threads  batch {batch_size:>3}: "
+                  f"p50 {result['p50_ms']:8.1f} ms  p95 {result['p95_ms']:8.1f} ms  "
+                  f"{result['sentences_per_s']:8.1f} sentences/s")
+
+    smallest_batch = min(args.batch_sizes)
+    best_single = min(
+        (result for result in single_process if result['batch_size'] == smallest_batch),
+        key=lambda result: result['p50_ms']
+    )
+
+    # Phase 2: process layouts sharing the machine
+    layouts = []
+    for processes in args.processes or powers_of_two_up_to(len(cores)):
+        threads = max(len(cores) // processes, 1)
+        for batch_size in args.batch_sizes:
+            result = measure(processes, threads, batch_size, cores, args)
+            layouts.append(result)
+            print(f"  {processes:>2} processes x {threads:>2} threads  batch {batch_size:>3}: "
+                  f"p50 {result['p50_ms']:8.1f} ms  p95 {result['p95_ms']:8.1f} ms  "
+                  f"{result['sentences_per_s']:8.1f} sentences/s")
+
+    eligible = [result for result in layouts
+                if args.latency_slo_ms is None or result['p95_ms'] <= args.latency_slo_ms]
+    if not eligible:
+        print(f"⚠️ No layout meets p95 <= {args.latency_slo_ms} ms, choosing the lowest-latency one")
+        eligible = [min(layouts, key=lambda result: result['p95_ms'])]
+    best_layout = max(eligible, key=lambda result: result['sentences_per_s'])
+
+    import torch
+    profile = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'host': {
+            'cpu_count': os.cpu_count(),
+            'cores_tuned': len(cores),
+            'processor': platform.processor(),
+            'platform': platform.platform(),
+            'torch': torch.__version__
+        },
+        'intra_op_threads': best_layout['threads'],
+        'inter_op_threads': 1,
+        'single_process_threads': best_single['threads'],
+        'server': {
+            'workers': best_layout['processes'],
+            'threads_per_worker': best_layout['threads'],
+            'max_batch': best_layout['batch_size']
+        },
+        'settings': {key: getattr(args, key) for key in ('src_len', 'decode_steps', 'iterations', 'latency_slo_ms')},
+        'results': {'single_process': single_process, 'layouts': layouts}
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, indent=2)
+
+    print(f"✅ Single process: {profile['single_process_threads']} intra-op threads "
+          f"(p50 {best_single['p50_ms']:.1f} ms at batch {smallest_batch})")
+    print(f"✅ Server: {best_layout['processes']} workers x {best_layout['threads']} threads, "
+          f"max batch {best_layout['batch_size']} ({best_layout['sentences_per_s']:.1f} sentences/s)")
+    print(f"✅ Standalone translator processes: {profile['intra_op_threads']} threads each "
+          f"(URDU_TRANSLATOR_PROCESSES=1 for a lone process)")
+    print(f"✅ Profile written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
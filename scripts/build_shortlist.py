@@ -0,0 +1,84 @@
+# build_shortlist.py - Build the Urdu-piece to Roman-piece co-occurrence shortlist
+#
+# Run from the repository root:
+#     python -m scripts.build_shortlist --corpus data/train.tsv --output shortlist.json
+#
+# The corpus is a UTF-8 TSV of "urdu<TAB>roman" pairs. Enable the result with
+# UrduRomanTranslator(shortlist_path='shortlist.json') or URDU_TRANSLATOR_SHORTLIST.
+
+import argparse
+import json
+from collections import Counter, defaultdict
+
+from tqdm import tqdm
+
+from text_processing import SimplifiedMultiLevelTokenizer, ultra_clean_urdu
+
+SPECIAL_IDS = {0, 1, 2, 3}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a lexical shortlist from a parallel corpus")
+    parser.add_argument('--corpus', required=True)
+    parser.add_argument('--output', default='shortlist.json')
+    parser.add_argument('--top-k', type=int, default=50, help="Roman pieces kept per Urdu piece")
+    parser.add_argument('--frequent', type=int, default=500, help="Most frequent Roman pieces always kept")
+    parser.add_argument('--min-count', type=int, default=2, help="Minimum co-occurrence count")
+    args = parser.parse_args()
+
+    src_tokenizer = SimplifiedMultiLevelTokenizer('urdu', vocab_sizes=[15000])
+    tgt_tokenizer = SimplifiedMultiLevelTokenizer('roman', vocab_sizes=[12000])
+    if not (src_tokenizer.load_pretrained('urdu_level0.model') and tgt_tokenizer.load_pretrained('roman_level0.model')):
+        raise FileNotFoundError("Tokenizer model files not found")
+    roman_sp = tgt_tokenizer.tokenizers['level0']
+
+    # Sentence-level co-occurrence counts
+    cooccurrence = defaultdict(Counter)
+    tgt_frequency = Counter()
+    sentences = 0
+
+    with open(args.corpus, encoding='utf-8') as f:
+        for line in tqdm(f, desc="Counting", unit=" pairs"):
+            fields = line.rstrip('\n').split('\t')
+            if len(fields) < 2:
+                continue
+
+            cleaned = ultra_clean_urdu(fields[0])
+            if not cleaned:
+                continue
+
+            src_ids = set(src_tokenizer.encode_multilevel(cleaned)['level0']) - SPECIAL_IDS
+            tgt_pieces = roman_sp.encode(fields[1].strip(), out_type=int)
+            tgt_frequency.update(tgt_pieces)
+            tgt_ids = set(tgt_pieces) - SPECIAL_IDS
+
+            for src_id in src_ids:
+                cooccurrence[src_id].update(tgt_ids)
+            sentences += 1
+
+    # Keep the Roman pieces most likely given each Urdu piece; for a fixed Urdu
+    # piece, p(roman | urdu) ranks like the raw co-occurrence count
+    table = {}
+    for src_id, counter in cooccurrence.items():
+        table[str(src_id)] = sorted(
+            tgt_id for tgt_id, count in counter.most_common(args.top_k) if count >= args.min_count
+        )
+
+    frequent = sorted(tgt_id for tgt_id, _ in tgt_frequency.most_common(args.frequent))
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'sentences': sentences,
+            'top_k': args.top_k,
+            'frequent': frequent,
+            'table': table
+        }, f)
+
+    sizes = [len(ids) for ids in table.values()] or [0]
+    print(f"✅ Shortlist written to {args.output}")
+    print(f"   Pairs: {sentences:,}  Urdu pieces: {len(table):,}  "
+          f"avg candidates/piece: {sum(sizes) / len(sizes):.1f}  frequent: {len(frequent)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# check_cache.py - Check that repeated sentences are served from the translation cache
+#
+# Run from the repository root:
+#     python -m scripts.check_cache
+#
+# Translates the sample sentences twice, one call at a time. Every second-pass
+# call must be a cache hit with the same output as the first pass; exits with
+# status 1 otherwise.
+
+import argparse
+import time
+
+from model_wrapper import UrduRomanTranslator
+
+SAMPLE_PATH = 'benchmarks/sample_urdu.txt'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that repeated translations hit the cache")
+    parser.add_argument('--model', default='best_attention_model.pth')
+    parser.add_argument('--sentences', default=SAMPLE_PATH)
+    args = parser.parse_args()
+
+    with open(args.sentences, encoding='utf-8') as f:
+        sentences = list(dict.fromkeys(line.strip() for line in f if line.strip()))
+
+    translator = UrduRomanTranslator(model_path=args.model, cache_size=len(sentences) * 2)
+
+    timings, outputs, hits = {}, {}, {}
+    for name in ('first', 'repeat'):
+        before = translator.cache.stats()['hits']
+        start = time.perf_counter()
+        outputs[name] = [translator.translate(sentence)[0] for sentence in sentences]
+        timings[name] = time.perf_counter() - start
+        hits[name] = translator.cache.stats()['hits'] - before
+
+    changed = [(s, a, b) for s, a, b in zip(sentences, outputs['first'], outputs['repeat']) if a != b]
+    for sentence, first, repeat in changed:
+        print(f"✗ {sentence}\n    first:  {first}\n    repeat: {repeat}")
+
+    print(f"Cache entries: {len(translator.cache)}, repeat-pass hits: {hits['repeat']}/{len(sentences)}")
+    print(f"Time: first {timings['first']:.2f}s, repeat {timings['repeat']:.3f}s")
+
+    if hits['repeat'] != len(sentences) or changed:
+        print("❌ Repeated sentences were not all served from the cache")
+        raise SystemExit(1)
+    print("✅ Repeated sentences served from the cache")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# check_onnx_parity.py - Compare ONNX backend output with the PyTorch model on a fixed sentence set
+#
+# Run from the repository root after exporting:
+#     python -m scripts.check_onnx_parity --model-dir onnx_model
+#
+# Both backends decode under the same per-row decode budget (--decode-budget,
+# else $URDU_TRANSLATOR_DECODE_BUDGET / decode_budget.json / the defaults).
+# Exits with status 1 if fewer than --min-match of the translations are identical.
+
+import argparse
+import time
+
+from decode_budget import resolve_decode_budget
+from model_wrapper import UrduRomanTranslator
+from onnx_backend import OnnxUrduRomanTranslator
+
+SAMPLE_PATH = 'benchmarks/sample_urdu.txt'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check ONNX/PyTorch translation parity")
+    parser.add_argument('--model', default='best_attention_model.pth')
+    parser.add_argument('--model-dir', default='onnx_model')
+    parser.add_argument('--sentences', default=SAMPLE_PATH)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--min-match', type=float, default=1.0)
+    parser.add_argument('--decode-budget', default=None, help="Decode budget JSON written by fit_decode_budget")
+    args = parser.parse_args()
+
+    with open(args.sentences, encoding='utf-8') as f:
+        sentences = [line.strip() for line in f if line.strip()]
+
+    budget = resolve_decode_budget(args.decode_budget)
+    torch_translator = UrduRomanTranslator(model_path=args.model, cache_size=0, decode_budget=budget)
+    onnx_translator = OnnxUrduRomanTranslator(model_dir=args.model_dir, decode_budget=budget)
+
+    timings = {}
+    outputs = {}
+    for name, translator in (('torch', torch_translator), ('onnx', onnx_translator)):
+        start = time.perf_counter()
+        outputs[name] = [t for t, _ in translator.translate_batch(sentences, batch_size=args.batch_size)]
+        timings[name] = time.perf_counter() - start
+
+    mismatches = [(s, a, b) for s, a, b in zip(sentences, outputs['torch'], outputs['onnx']) if a != b]
+    for sentence, torch_output, onnx_output in mismatches:
+        print(f"✗ {sentence}\n    torch: {torch_output}\n    onnx:  {onnx_output}")
+
+    match_rate = 1 - len(mismatches) / len(sentences)
+    print(f"Identical: {len(sentences) - len(mismatches)}/{len(sentences)} ({match_rate:.1%})")
+    print(f"Batch time: torch {timings['torch']:.2f}s, onnx {timings['onnx']:.2f}s")
+
+    if match_rate < args.min_match:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
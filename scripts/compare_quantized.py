@@ -0,0 +1,84 @@
+# compare_quantized.py - Quality, latency and size of the int8 quantized model against fp32
+#
+# Run from the repository root:
+#     python -m scripts.compare_quantized --corpus data/test.tsv
+#
+# The corpus is a UTF-8 TSV of "urdu<TAB>roman" pairs. Without one, the
+# bundled sample sentences are used and only fp32/int8 agreement is reported.
+
+import argparse
+import time
+
+import numpy as np
+import sacrebleu
+
+from benchmarks.common import character_error_rate, load_corpus
+from model_wrapper import UrduRomanTranslator
+
+SAMPLE_PATH = 'benchmarks/sample_urdu.txt'
+
+
+def evaluate(translator, sources, batch_size):
+    """Translate sources one by one (latency) and in batches (throughput)."""
+    outputs, latencies = [], []
+    for text in sources:
+        start = time.perf_counter()
+        translation, _ = translator.translate(text)
+        latencies.append(time.perf_counter() - start)
+        outputs.append(translation)
+
+    start = time.perf_counter()
+    translator.translate_batch(sources, batch_size=batch_size)
+    batch_seconds = time.perf_counter() - start
+
+    return outputs, {
+        'p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'p95_ms': float(np.percentile(latencies, 95) * 1000),
+        'batch_sentences_per_s': len(sources) / batch_seconds
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare int8 dynamic quantization with fp32")
+    parser.add_argument('--model', default='best_attention_model.pth')
+    parser.add_argument('--corpus', default=SAMPLE_PATH)
+    parser.add_argument('--limit', type=int, default=1000)
+    parser.add_argument('--batch-size', type=int, default=32)
+    args = parser.parse_args()
+
+    pairs = load_corpus(args.corpus, args.limit)
+    sources = [urdu for urdu, _ in pairs]
+    references = [roman for _, roman in pairs]
+    has_references = all(ref is not None for ref in references)
+
+    results = {}
+    for name, quantize in (('fp32', False), ('int8', True)):
+        translator = UrduRomanTranslator(model_path=args.model, cache_size=0, quantize=quantize)
+        outputs, timing = evaluate(translator, sources, args.batch_size)
+        results[name] = {'outputs': outputs, 'timing': timing, 'footprint': translator.model_footprint}
+
+    print(f"\nSentences: {len(sources)}")
+    print(f"{'':>6} {'BLEU':>7} {'CER':>7} {'p50 ms':>8} {'p95 ms':>8} {'batch sent/s':>13}")
+    for name, result in results.items():
+        bleu = cer = float('nan')
+        if has_references:
+            bleu = sacrebleu.corpus_bleu(result['outputs'], [references]).score
+            cer = character_error_rate(result['outputs'], references)
+        timing = result['timing']
+        print(f"{name:>6} {bleu:>7.2f} {cer:>7.4f} {timing['p50_ms']:>8.2f} {timing['p95_ms']:>8.2f} "
+              f"{timing['batch_sentences_per_s']:>13.1f}")
+
+    fp32_outputs, int8_outputs = results['fp32']['outputs'], results['int8']['outputs']
+    agreement = sum(a == b for a, b in zip(fp32_outputs, int8_outputs)) / max(len(sources), 1)
+    print(f"\nint8 vs fp32: exact match {agreement:.1%}, "
+          f"BLEU {sacrebleu.corpus_bleu(int8_outputs, [fp32_outputs]).score:.2f}, "
+          f"CER {character_error_rate(int8_outputs, fp32_outputs):.4f}")
+
+    footprint = results['int8']['footprint']
+    if footprint:
+        print(f"Model size: {footprint['fp32_bytes'] / 1e6:.1f} MB fp32 -> "
+              f"{footprint['int8_bytes'] / 1e6:.1f} MB int8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# export_onnx.py - Export the encoder and a single decoder step to ONNX
+#
+# Run from the repository root:
+#     python -m scripts.export_onnx --output-dir onnx_model
+#
+# The output directory is self-contained for OnnxUrduRomanTranslator:
+# encoder.onnx, decoder_step.onnx, config.json and the tokenizer models.
+
+import argparse
+import json
+import os
+import shutil
+
+import torch
+import torch.nn as nn
+
+from model_wrapper import UrduRomanTranslator
+
+
+class EncoderExport(nn.Module):
+    """Encoder plus everything computed once per source: decoder init states and attention keys."""
+
+    def __init__(self, model):
+        super().__init__()
+        self.encoder = model.encoder
+        self.decoder = model.decoder
+
+    def forward(self, src_ids, src_lengths):
+        encoder_outputs, encoder_hidden, encoder_cell = self.encoder(src_ids, src_lengths)
+        hidden_states, cell_states = self.decoder.init_hidden_states(encoder_outputs, encoder_hidden, encoder_cell)
+        keys = self.decoder.attention.encoder_projection(encoder_outputs)
+        return encoder_outputs, keys, torch.stack(hidden_states), torch.stack(cell_states)
+
+
+class DecoderStepExport(nn.Module):
+    """One decoder step with explicit [num_layers, batch, hidden] state tensors."""
+
+    def __init__(self, decoder):
+        super().__init__()
+        self.decoder = decoder
+
+    def forward(self, input_token, hidden, cell, encoder_outputs, keys, pad_mask):
+        attention_cache = {'encoder_outputs': encoder_outputs, 'keys': keys, 'pad_mask': pad_mask}
+        logits, hidden_states, cell_states, _ = self.decoder.forward_step(
+            input_token.unsqueeze(1), list(hidden.unbind(0)), list(cell.unbind(0)),
+            encoder_outputs, None, attention_cache=attention_cache
+        )
+        return logits, torch.stack(hidden_states), torch.stack(cell_states)
+
+
+def export(translator, output_dir, opset):
+    model = translator.model.cpu().eval()
+    decoder = model.decoder
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Example inputs (batch 2 with different lengths so padding is exercised)
+    src_ids = torch.tensor([[3, 10, 11, 12, 1], [3, 20, 21, 1, 0]])
+    src_lengths = torch.tensor([5, 4])
+
+    encoder = EncoderExport(model).eval()
+    with torch.no_grad():
+        encoder_outputs, keys, hidden, cell = encoder(src_ids, src_lengths)
+
+    torch.onnx.export(
+        encoder, (src_ids, src_lengths), os.path.join(output_dir, 'encoder.onnx'),
+        input_names=['src_ids', 'src_lengths'],
+        output_names=['encoder_outputs', 'keys', 'hidden', 'cell'],
+        dynamic_axes={
+            'src_ids': {0: 'batch', 1: 'src_len'},
+            'src_lengths': {0: 'batch'},
+            'encoder_outputs': {0: 'batch', 1: 'src_len'},
+            'keys': {0: 'batch', 1: 'src_len'},
+            'hidden': {1: 'batch'},
+            'cell': {1: 'batch'}
+        },
+        opset_version=opset,
+        dynamo=False
+    )
+
+    pad_mask = torch.arange(encoder_outputs.size(1)).unsqueeze(0) >= src_lengths.unsqueeze(1)
+    input_token = torch.full((2,), 3, dtype=torch.long)
+    torch.onnx.export(
+        DecoderStepExport(decoder).eval(), (input_token, hidden, cell, encoder_outputs, keys, pad_mask),
+        os.path.join(output_dir, 'decoder_step.onnx'),
+        input_names=['input_token', 'hidden', 'cell', 'encoder_outputs', 'keys', 'pad_mask'],
+        output_names=['logits', 'next_hidden', 'next_cell'],
+        dynamic_axes={
+            'input_token': {0: 'batch'},
+            'hidden': {1: 'batch'},
+            'cell': {1: 'batch'},
+            'encoder_outputs': {0: 'batch', 1: 'src_len'},
+            'keys': {0: 'batch', 1: 'src_len'},
+            'pad_mask': {0: 'batch', 1: 'src_len'},
+            'logits': {0: 'batch'},
+            'next_hidden': {1: 'batch'},
+            'next_cell': {1: 'batch'}
+        },
+        opset_version=opset,
+        dynamo=False
+    )
+
+    config = dict(translator.config or {})
+    config.update({
+        'best_bleu': float(translator.best_bleu),
+        'num_layers': decoder.num_layers,
+        'decoder_hidden_dim': decoder.decoder_hidden_dim,
+        'tgt_vocab_size': decoder.vocab_size,
+        'opset': opset
+    })
+    with open(os.path.join(output_dir, 'config.json'), 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2)
+
+    for tokenizer_file in ('urdu_level0.model', 'roman_level0.model'):
+        shutil.copy(tokenizer_file, os.path.join(output_dir, tokenizer_file))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the translator to ONNX")
+    parser.add_argument('--model', default='best_attention_model.pth')
+    parser.add_argument('--output-dir', default='onnx_model')
+    parser.add_argument('--opset', type=int, default=17)
+    args = parser.parse_args()
+
+    translator = UrduRomanTranslator(model_path=args.model, cache_size=0)
+    export(translator, args.output_dir, args.opset)
+    print(f"✅ Exported ONNX model to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# fit_decode_budget.py - Fit the source-length decode budget on a parallel corpus
+#
+# Run from the repository root:
+#     python -m scripts.fit_decode_budget --corpus data/train.tsv --output decode_budget.json
+#
+# The corpus is a UTF-8 TSV of "urdu<TAB>roman" pairs. Lengths are counted the
+# way the translator sees them: source tokens include BOS and EOS, target steps
+# include the EOS step. The ratio is the least-squares slope of target steps
+# on source tokens (through the origin); the margin is the --coverage quantile
+# of the residuals plus --extra-margin, so at least that share of reference
+# translations fits inside ceil(ratio * source_tokens + margin).
+# UrduRomanTranslator and OnnxUrduRomanTranslator pick up decode_budget.json
+# (or $URDU_TRANSLATOR_DECODE_BUDGET) automatically.
+
+import argparse
+import json
+
+import numpy as np
+from tqdm import tqdm
+
+from text_processing import SimplifiedMultiLevelTokenizer, ultra_clean_urdu
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit a source-length-adaptive decode budget")
+    parser.add_argument('--corpus', required=True)
+    parser.add_argument('--output', default='decode_budget.json')
+    parser.add_argument('--coverage', type=float, default=0.999,
+                        help="Share of reference translations the budget must cover")
+    parser.add_argument('--extra-margin', type=float, default=2.0,
+                        help="Steps added on top of the fitted margin as headroom")
+    args = parser.parse_args()
+
+    src_tokenizer = SimplifiedMultiLevelTokenizer('urdu', vocab_sizes=[15000])
+    tgt_tokenizer = SimplifiedMultiLevelTokenizer('roman', vocab_sizes=[12000])
+    if not (src_tokenizer.load_pretrained('urdu_level0.model') and tgt_tokenizer.load_pretrained('roman_level0.model')):
+        raise FileNotFoundError("Tokenizer model files not found")
+    roman_sp = tgt_tokenizer.tokenizers['level0']
+
+    src_lengths, tgt_lengths = [], []
+    with open(args.corpus, encoding='utf-8') as f:
+        for line in tqdm(f, desc="Measuring", unit=" pairs"):
+            fields = line.rstrip('\n').split('\t')
+            if len(fields) < 2:
+                continue
+
+            cleaned = ultra_clean_urdu(fields[0])
+            if not cleaned or not fields[1].strip():
+                continue
+
+            src_lengths.append(len(src_tokenizer.encode_multilevel(cleaned)['level0']))
+            tgt_lengths.append(len(roman_sp.encode(fields[1].strip(), out_type=int)) + 1)  # + EOS step
+
+    if len(src_lengths) < 2:
+        raise ValueError(f"Need at least two sentence pairs in {args.corpus}")
+
+    src = np.array(src_lengths, dtype=np.float64)
+    tgt = np.array(tgt_lengths, dtype=np.float64)
+    ratio = float(np.sum(src * tgt) / np.sum(src * src))  # slope through the origin
+    residuals = tgt - ratio * src
+    margin = float(np.quantile(residuals, args.coverage)) + args.extra_margin
+
+    budgets = np.ceil(ratio * src + margin)
+    covered = float(np.mean(tgt <= budgets))
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'ratio': ratio,
+            'margin': margin,
+            'coverage_target': args.coverage,
+            'coverage': covered,
+            'pairs': len(src_lengths),
+            'mean_source_tokens': float(src.mean()),
+            'mean_target_steps': float(tgt.mean()),
+            'max_target_over_source': float((tgt / src).max())
+        }, f, indent=2)
+
+    print(f"✅ Decode budget written to {args.output}")
+    print(f"   budget = ceil({ratio:.3f} x source tokens + {margin:.2f})  "
+          f"covers {covered:.2%} of {len(src_lengths):,} pairs")
+    print(f"   mean budget {budgets.mean():.1f} steps vs mean reference {tgt.mean():.1f} "
+          f"(fixed max_length=200 would allow {200 / tgt.mean():.1f}x)")
+    if covered < args.coverage:
+        print(f"⚠️ Coverage {covered:.2%} is below the {args.coverage:.2%} target; "
+              f"consider a larger --extra-margin")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# import_time_report.py - Cold-start import cost of the app and its modules
+#
+# Run from the repository root:
+#     python -m scripts.import_time_report
+#     python -m scripts.import_time_report --budget-ms 1500 --output import_times.json
+#
+# Each target is imported in a fresh interpreter with `python -X importtime`.
+# The report shows each target's cumulative import time (interpreter start-up
+# excluded), the slowest packages it imported directly, and whether torch was
+# loaded. It exits with status 1 if the UI shell (streamlit_app) imports torch
+# or exceeds --budget-ms.
+
+import argparse
+import json
+import subprocess
+import sys
+
+# The UI shell first, then the modules it defers to the background loader
+TARGETS = ['streamlit_app', 'ui_assets', 'translation_stats', 'text_processing', 'model_wrapper', 'torch']
+SHELL_TARGET = 'streamlit_app'
+
+
+def measure_import(module, repeats):
+    """Best-of-``repeats`` import profile of one module in a fresh interpreter."""
+    best = None
+    for _ in range(repeats):
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c',
+             f"import sys, {module}; print('torch' in sys.modules)"],
+            capture_output=True, text=True
+        )
+        if process.returncode != 0:
+            return {'module': module, 'error': process.stderr.strip().splitlines()[-1:]}
+
+        # "import time: self [us] | cumulative | imported package"; nested imports are
+        # indented two spaces per level and printed before the module that imported them
+        children, packages, total_ms = {}, {}, None
+        for line in process.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            if depth == 1:
+                children[name.strip()] = int(cumulative) / 1000
+            elif depth == 0:
+                if name.strip() == module:
+                    total_ms, packages = int(cumulative) / 1000, children
+                children = {}
+
+        result = {
+            'module': module,
+            'total_ms': total_ms or 0.0,
+            'imports_torch': process.stdout.strip().splitlines()[-1] == 'True',
+            'top_packages_ms': dict(sorted(packages.items(), key=lambda item: -item[1])[:8])
+        }
+        if best is None or result['total_ms'] < best['total_ms']:
+            best = result
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report cold-start import times")
+    parser.add_argument('--targets', nargs='+', default=TARGETS)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--budget-ms', type=float, default=None, help=f"Import budget for {SHELL_TARGET}")
+    parser.add_argument('--output', default=None, help="Write the report as JSON")
+    args = parser.parse_args()
+
+    results = [measure_import(module, args.repeats) for module in args.targets]
+
+    failures = []
+    for result in results:
+        if 'error' in result:
+            print(f"❌ {result['module']}: import failed {result['error']}")
+            continue
+
+        print(f"{result['module']:<20} {result['total_ms']:9.1f} ms   torch={'yes' if result['imports_torch'] else 'no'}")
+        for package, ms in result['top_packages_ms'].items():
+            print(f"    {package:<30} {ms:9.1f} ms")
+
+        if result['module'] == SHELL_TARGET:
+            if result['imports_torch']:
+                failures.append(f"{SHELL_TARGET} imports torch at startup")
+            if args.budget_ms is not None and result['total_ms'] > args.budget_ms:
+                failures.append(f"{SHELL_TARGET} takes {result['total_ms']:.0f} ms (budget {args.budget_ms:.0f} ms)")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'budget_ms': args.budget_ms, 'results': results}, f, indent=2)
+        print(f"✅ Report written to {args.output}")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
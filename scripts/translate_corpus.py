@@ -0,0 +1,188 @@
+# translate_corpus.py - Streaming bulk translation of TXT / TSV / JSONL files with resume
+#
+# Run from the repository root:
+#     python -m scripts.translate_corpus archive.txt archive.roman.txt
+#     python -m scripts.translate_corpus pairs.tsv out.tsv --column 1
+#     python -m scripts.translate_corpus docs.jsonl out.jsonl --field text --output-field roman
+#
+# The input is read line by line in chunks of --batch-size, so memory stays
+# bounded regardless of file size. After every chunk the output is flushed
+# and a checkpoint (input/output byte offsets) is written next to the
+# output; rerunning the same command resumes from there.
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from model_wrapper import UrduRomanTranslator
+
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    return {'.tsv': 'tsv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}.get(extension, 'txt')
+
+
+def read_chunk(f, size):
+    """Read up to size lines (as bytes) from a binary file."""
+    lines = []
+    for _ in range(size):
+        line = f.readline()
+        if not line:
+            break
+        lines.append(line)
+    return lines
+
+
+def extract_text(line, args):
+    """Urdu text of one input line."""
+    if args.format == 'tsv':
+        fields = line.split('\t')
+        return fields[args.column] if args.column < len(fields) else ""
+    if args.format == 'jsonl':
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return ""  # blank or malformed lines pass through untranslated
+        value = record.get(args.field, "") if isinstance(record, dict) else ""
+        return value if isinstance(value, str) else ""
+    return line
+
+
+def format_output(line, translation, args):
+    """Output line for one input line and its translation."""
+    if args.format == 'tsv':
+        return f"{line}\t{translation}\n"
+    if args.format == 'jsonl':
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return line + "\n"
+        if not isinstance(record, dict):
+            return line + "\n"
+        record[args.output_field] = translation
+        return json.dumps(record, ensure_ascii=False) + "\n"
+    return translation + "\n"
+
+
+def load_checkpoint(path, input_path, input_size):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    if checkpoint.get('input_path') != os.path.abspath(input_path) or checkpoint.get('input_size') != input_size:
+        raise SystemExit(f"Checkpoint {path} belongs to a different input; use --restart to start over")
+    return checkpoint
+
+
+def save_checkpoint(path, checkpoint):
+    """Write the checkpoint atomically."""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600:d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Translate a large Urdu corpus file with checkpointing")
+    parser.add_argument('input')
+    parser.add_argument('output')
+    parser.add_argument('--format', choices=['txt', 'tsv', 'jsonl'], default=None,
+                        help="Input format (default: from the file extension)")
+    parser.add_argument('--column', type=int, default=0, help="TSV column holding the Urdu text")
+    parser.add_argument('--field', default='text', help="JSONL field holding the Urdu text")
+    parser.add_argument('--output-field', default='roman', help="JSONL field for the translation")
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--max-length', type=int, default=200)
+    parser.add_argument('--beam-size', type=int, default=1)
+    parser.add_argument('--checkpoint', default=None, help="Checkpoint path (default: OUTPUT.ckpt)")
+    parser.add_argument('--restart', action='store_true', help="Ignore any checkpoint and start over")
+    parser.add_argument('--model', default='best_attention_model.pth')
+    args = parser.parse_args()
+
+    args.format = args.format or detect_format(args.input)
+    checkpoint_path = args.checkpoint or args.output + '.ckpt'
+    input_size = os.path.getsize(args.input)
+
+    checkpoint = None if args.restart else load_checkpoint(checkpoint_path, args.input, input_size)
+    if checkpoint is None:
+        checkpoint = {
+            'input_path': os.path.abspath(args.input),
+            'input_size': input_size,
+            'input_offset': 0,
+            'output_offset': 0,
+            'lines_done': 0,
+            'errors': 0
+        }
+    else:
+        print(f"↻ Resuming at line {checkpoint['lines_done']:,} "
+              f"({checkpoint['input_offset'] / max(input_size, 1):.1%} of input)", file=sys.stderr)
+
+    translator = UrduRomanTranslator(model_path=args.model, cache_size=10000)
+
+    # Drop any output written after the last checkpoint
+    mode = 'r+b' if os.path.exists(args.output) and checkpoint['output_offset'] else 'wb'
+    with open(args.input, 'rb') as source, open(args.output, mode) as target:
+        source.seek(checkpoint['input_offset'])
+        target.seek(checkpoint['output_offset'])
+        target.truncate()
+
+        start_time = time.time()
+        start_offset = checkpoint['input_offset']
+        sentences = characters = 0
+
+        while True:
+            raw_lines = read_chunk(source, args.batch_size)
+            if not raw_lines:
+                break
+
+            lines = [raw.decode('utf-8', errors='replace').rstrip('\r\n') for raw in raw_lines]
+            texts = [extract_text(line, args) for line in lines]
+            results = translator.translate_batch(
+                texts, max_length=args.max_length, batch_size=args.batch_size, beam_size=args.beam_size
+            )
+
+            output = []
+            for line, text, (translation, _) in zip(lines, texts, results):
+                if translation.startswith("Error:"):
+                    if text.strip():
+                        checkpoint['errors'] += 1
+                    translation = ""
+                output.append(format_output(line, translation, args))
+                characters += len(text)
+
+            target.write(''.join(output).encode('utf-8'))
+            target.flush()
+            os.fsync(target.fileno())
+
+            sentences += len(lines)
+            checkpoint['input_offset'] = source.tell()
+            checkpoint['output_offset'] = target.tell()
+            checkpoint['lines_done'] += len(lines)
+            save_checkpoint(checkpoint_path, checkpoint)
+
+            # Progress: throughput of this run and ETA from the remaining bytes
+            elapsed = max(time.time() - start_time, 1e-9)
+            bytes_per_second = (checkpoint['input_offset'] - start_offset) / elapsed
+            remaining = (input_size - checkpoint['input_offset']) / bytes_per_second if bytes_per_second else 0
+            print(f"\r{checkpoint['lines_done']:,} lines | {sentences / elapsed:,.1f} sent/s | "
+                  f"{characters / elapsed:,.0f} chars/s | "
+                  f"{checkpoint['input_offset'] / max(input_size, 1):.1%} | ETA {format_duration(remaining)}",
+                  end='', file=sys.stderr, flush=True)
+
+    print(f"\n✅ Done: {checkpoint['lines_done']:,} lines, {checkpoint['errors']:,} errors, "
+          f"written to {args.output}", file=sys.stderr)
+    if os.path.exists(checkpoint_path):  # an empty input never writes one
+        os.remove(checkpoint_path)
+
+
+if __name__ == "__main__":
+    main()
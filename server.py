@@ -0,0 +1,314 @@
+# server.py - Headless HTTP/JSON inference server with pre-forked workers
+#
+#     python server.py --port 8080 --workers 4
+#
+# The model is loaded once in the parent process before forking, so worker
+# processes share its weights copy-on-write. Each worker is pinned to its own
+# slice of the CPU cores, sets its own torch thread count and batches
+# concurrent requests with a MicroBatchScheduler. Each worker warms the model
+# up in the background (after fork, with its own thread pool) while it already
+# serves /health and /ready; /translate* answers 503 until warm-up finishes.
+#
+# Workers share one listening socket, so /metrics on the main port reaches an
+# arbitrary worker. For per-worker scraping use --metrics-port (worker i
+# serves on metrics_port + i) or --metrics-dir (one .prom file per worker for
+# node_exporter's textfile collector). Every sample carries a worker label.
+#
+# Endpoints:
+#     GET  /health            liveness
+#     GET  /ready             readiness (503 until the worker has warmed up and can serve)
+#     GET  /metrics           Prometheus metrics of the worker that answers
+#     POST /translate         {"text": "...", "max_length": 200, "beam_size": 1}
+#     POST /translate_batch   {"texts": ["...", ...], "max_length": 200, "beam_size": 1}
+
+import argparse
+import gc
+import json
+import os
+import queue
+import signal
+import socket
+import sys
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import torch
+
+import metrics
+from batch_scheduler import MicroBatchScheduler
+from cpu_profile import load_cpu_profile
+from model_wrapper import UrduRomanTranslator
+
+MAX_BODY_BYTES = 1024 * 1024
+MAX_BATCH_TEXTS = 256
+MAX_DECODE_LENGTH = 1000
+
+
+def error_status(translation):
+    """HTTP status for a translator error message."""
+    if translation.startswith("Error: Empty"):
+        return 400
+    if "queue is full" in translation:
+        return 503
+    return 500
+
+
+class TranslationRequestHandler(BaseHTTPRequestHandler):
+    """JSON endpoints around the worker's scheduler."""
+
+    server_version = "UrduTranslator/1.0"
+
+    def log_message(self, format, *args):
+        pass  # keep per-request logs off the hot path
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length', 0))
+        if length <= 0 or length > MAX_BODY_BYTES:
+            raise ValueError(f"Body must be 1..{MAX_BODY_BYTES} bytes")
+        payload = json.loads(self.rfile.read(length).decode('utf-8'))
+        if not isinstance(payload, dict):
+            raise ValueError("Body must be a JSON object")
+        return payload
+
+    @staticmethod
+    def _decoding_params(payload):
+        max_length = payload.get('max_length', 200)
+        beam_size = payload.get('beam_size', 1)
+        if not isinstance(max_length, int) or not 1 <= max_length <= MAX_DECODE_LENGTH:
+            raise ValueError(f"max_length must be an integer in 1..{MAX_DECODE_LENGTH}")
+        if not isinstance(beam_size, int) or not 1 <= beam_size <= 16:
+            raise ValueError("beam_size must be an integer in 1..16")
+        return max_length, beam_size
+
+    def _send_metrics(self):
+        body = self.server.scheduler.metrics.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', metrics.CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/metrics' and self.server.scheduler is not None:
+            self._send_metrics()
+        elif self.path == '/health':
+            self._send_json(200, {'status': 'ok', 'pid': os.getpid()})
+        elif self.path == '/ready':
+            ready = self.server.scheduler is not None and self.server.scheduler.is_ready
+            self._send_json(200 if ready else 503, {'ready': ready, 'pid': os.getpid()})
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        if self.path not in ('/translate', '/translate_batch'):
+            self._send_json(404, {'error': 'Not found'})
+            return
+
+        if not self.server.scheduler.is_ready:
+            self._send_json(503, {'error': "Worker is warming up, please retry"})
+            return
+
+        try:
+            payload = self._read_json()
+            max_length, beam_size = self._decoding_params(payload)
+        except (ValueError, UnicodeDecodeError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+
+        try:
+            if self.path == '/translate':
+                text = payload.get('text')
+                if not isinstance(text, str):
+                    self._send_json(400, {'error': '"text" must be a string'})
+                    return
+
+                translation, time_taken = self.server.scheduler.translate(text, max_length, beam_size)
+                if translation.startswith("Error:"):
+                    self._send_json(error_status(translation), {'error': translation})
+                else:
+                    self._send_json(200, {'translation': translation, 'time': time_taken})
+
+            else:
+                texts = payload.get('texts')
+                if (not isinstance(texts, list) or not 0 < len(texts) <= MAX_BATCH_TEXTS
+                        or not all(isinstance(text, str) for text in texts)):
+                    self._send_json(400, {'error': f'"texts" must be a list of 1..{MAX_BATCH_TEXTS} strings'})
+                    return
+
+                # Individual texts join the shared queue, so they batch with other clients too
+                futures = [self.server.scheduler.submit(text, max_length, beam_size) for text in texts]
+                results = []
+                for future in futures:
+                    translation, time_taken = future.result()
+                    if translation.startswith("Error:"):
+                        results.append({'error': translation})
+                    else:
+                        results.append({'translation': translation, 'time': time_taken})
+                self._send_json(200, {'results': results})
+
+        except queue.Full:
+            self._send_json(503, {'error': "Translation queue is full, please retry"})
+        except Exception as e:
+            self._send_json(500, {'error': f"{e.__class__.__name__}: {e}"})
+
+
+def split_cores(workers):
+    """Divide the CPUs available to this process into one contiguous slice per worker."""
+    if hasattr(os, 'sched_getaffinity'):
+        cores = sorted(os.sched_getaffinity(0))
+    else:
+        cores = list(range(os.cpu_count() or 1))
+
+    # With more workers than cores, slices wrap around and share cores
+    per_worker = max(len(cores) // workers, 1)
+    return [cores[(i * per_worker) % len(cores):][:per_worker] for i in range(workers)]
+
+
+def run_worker(index, listen_socket, translator, cores, args):
+    """Serve requests on the shared socket (runs in the forked child)."""
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cores)
+    torch.set_num_threads(args.threads or len(cores))
+
+    server = ThreadingHTTPServer(listen_socket.getsockname()[:2], TranslationRequestHandler,
+                                 bind_and_activate=False)
+    server.socket = listen_socket
+    server.daemon_threads = True
+
+    # Threads must be created after fork
+    server.scheduler = MicroBatchScheduler(
+        translator, max_batch_size=args.max_batch, max_wait_ms=args.batch_wait_ms,
+        max_queue_size=args.max_queue
+    )
+
+    registry = translator.metrics.registry
+    registry.const_labels['worker'] = str(index)
+    if args.metrics_port:
+        metrics.start_http_server(registry, args.metrics_port + index, host=args.metrics_host)
+    if args.metrics_dir:
+        metrics.start_textfile_writer(
+            registry, os.path.join(args.metrics_dir, f'urdu_translator_worker{index}.prom')
+        )
+
+    # Warm up with this worker's own thread pool; /translate* returns 503 until it is done
+    if not args.no_warmup:
+        translator.start_warmup()
+
+    print(f"   Worker {index} (pid {os.getpid()}): cores {cores}, {torch.get_num_threads()} threads")
+    server.serve_forever()
+
+
+def spawn_worker(index, listen_socket, translator, cores, args):
+    """Fork one worker process and return its pid."""
+    pid = os.fork()
+    if pid == 0:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        exit_code = 0
+        try:
+            run_worker(index, listen_socket, translator, cores, args)
+        except Exception:
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+    return pid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Urdu to Roman Urdu HTTP inference server")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=None, help="default: CPU profile, else 2")
+    parser.add_argument('--threads', type=int, default=None,
+                        help="torch threads per worker (default: CPU profile, else its cores)")
+    parser.add_argument('--model', default='best_attention_model.pth')
+    parser.add_argument('--max-batch', type=int, default=None, help="default: CPU profile, else 16")
+    parser.add_argument('--cpu-profile', default=None,
+                        help="Profile from scripts/autotune_cpu.py (default: $URDU_TRANSLATOR_CPU_PROFILE "
+                             "or cpu_profile.json)")
+    parser.add_argument('--batch-wait-ms', type=float, default=5.0)
+    parser.add_argument('--max-queue', type=int, default=256)
+    parser.add_argument('--cache-size', type=int, default=10000)
+    parser.add_argument('--no-warmup', action='store_true', help="Skip the per-worker warm-up")
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help="Serve each worker's /metrics on this port + worker index")
+    parser.add_argument('--metrics-host', default='127.0.0.1')
+    parser.add_argument('--metrics-dir', default=None,
+                        help="Write each worker's metrics to a .prom file in this directory")
+    args = parser.parse_args()
+
+    # Unset layout options come from the autotuned profile when there is one
+    server_profile = (load_cpu_profile(args.cpu_profile) or {}).get('server', {})
+    if args.workers is None:
+        args.workers = server_profile.get('workers', 2)
+    if args.threads is None:
+        args.threads = server_profile.get('threads_per_worker')
+    if args.max_batch is None:
+        args.max_batch = server_profile.get('max_batch', 16)
+    if server_profile:
+        print(f"   CPU profile: {args.workers} workers x {args.threads or 'all'} threads, max batch {args.max_batch}")
+
+    # No intra-op thread pool may exist before fork (OpenMP is not fork-safe)
+    torch.set_num_threads(1)
+    translator = UrduRomanTranslator(model_path=args.model, cache_size=args.cache_size, warmup=False,
+                                     cpu_profile=False)
+
+    listen_socket = socket.create_server((args.host, args.port), backlog=1024)
+    print(f"✅ Listening on http://{args.host}:{args.port}")
+
+    if not hasattr(os, 'fork'):
+        print("⚠️ os.fork is unavailable, serving from a single process")
+        run_worker(0, listen_socket, translator, split_cores(1)[0], args)
+        return
+
+    # Keep the loaded objects out of future GC passes so their pages stay shared
+    gc.freeze()
+
+    core_sets = split_cores(args.workers)
+    children = {
+        spawn_worker(i, listen_socket, translator, core_sets[i], args): i for i in range(args.workers)
+    }
+
+    stopping = False
+
+    def shutdown(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    # Supervise: restart workers that die unexpectedly
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+
+        index = children.pop(pid, None)
+        if index is not None and not stopping:
+            print(f"⚠️ Worker {index} (pid {pid}) exited with status {status}, restarting")
+            children[spawn_worker(index, listen_socket, translator, core_sets[index], args)] = index
+
+    listen_socket.close()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
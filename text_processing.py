@@ -0,0 +1,133 @@
+# text_processing.py - Torch-free text handling shared by the PyTorch and ONNX backends
+
+import os
+import re
+import unicodedata
+
+import sentencepiece as spm
+
+
+class SimplifiedMultiLevelTokenizer:
+    """Simplified multi-level tokenizer for deployment."""
+
+    def __init__(self, prefix, vocab_sizes=[15000]):
+        self.prefix = prefix
+        self.vocab_sizes = vocab_sizes
+        self.tokenizers = {}
+
+    def load_pretrained(self, model_file):
+        """Load pre-trained SentencePiece model."""
+        if os.path.exists(model_file):
+            sp = spm.SentencePieceProcessor()
+            sp.load(model_file)
+            self.tokenizers['level0'] = sp
+            print(f"Loaded {self.prefix} tokenizer with vocab size: {sp.get_piece_size()}")
+            return True
+        return False
+
+    def encode_multilevel(self, text):
+        """Encode text using primary level."""
+        if 'level0' not in self.tokenizers:
+            raise ValueError("Tokenizer not loaded")
+
+        primary_tokenizer = self.tokenizers['level0']
+        ids = [3] + primary_tokenizer.encode(text, out_type=int) + [1]  # BOS + text + EOS
+        return {'level0': ids}
+
+    def decode_multilevel(self, ids, level='level0'):
+        """Decode from specific level."""
+        if level in self.tokenizers:
+            clean_ids = [id for id in ids if id not in [0, 1, 3]]  # Remove PAD, EOS, BOS
+            return self.tokenizers[level].decode(clean_ids)
+        return ""
+
+    def is_word_start(self, id, level='level0'):
+        """Whether a piece begins a new word (SentencePiece '▁' prefix)."""
+        return self.tokenizers[level].id_to_piece(id).startswith('▁')
+
+    def get_vocab_size(self, level='level0'):
+        """Get vocabulary size for specific level."""
+        if level in self.tokenizers:
+            return self.tokenizers[level].get_piece_size()
+        return 0
+
+
+# Precompiled Urdu normalization: one str.translate table plus one regex
+_URDU_DIACRITIC_RANGES = [(0x064B, 0x065F), (0x0670, 0x0670), (0x06D6, 0x06ED), (0x08F0, 0x08FF)]
+_URDU_CHAR_REPLACEMENTS = {
+    "ك": "ک", "ي": "ی", "ة": "ہ", "أ": "ا", "إ": "ا", "آ": "ا",
+    "ؤ": "و", "ئ": "ی", "ء": ""
+}
+_URDU_PUNCTUATION = "۔،؍؎؏؞؟"
+
+
+def _build_urdu_translation_table():
+    """Map diacritics to nothing, Arabic forms to Urdu, and pad punctuation with spaces."""
+    table = {}
+    for first, last in _URDU_DIACRITIC_RANGES:
+        for codepoint in range(first, last + 1):
+            table[codepoint] = None
+    for old, new in _URDU_CHAR_REPLACEMENTS.items():
+        table[ord(old)] = new or None
+    for mark in _URDU_PUNCTUATION:
+        table[ord(mark)] = f" {mark} "
+    return table
+
+
+_URDU_TRANSLATION_TABLE = _build_urdu_translation_table()
+_NON_URDU_PATTERN = re.compile(r'[^\u0600-\u06FF\s]+')
+
+
+def ultra_clean_urdu(text: str) -> str:
+    """Enhanced Urdu cleaning for deployment.
+
+    NFC-normalizes (skipped when the input is already NFC), strips diacritics,
+    maps Arabic letter forms to Urdu, spaces out Urdu punctuation, replaces
+    non-Urdu characters with spaces and collapses whitespace.
+    """
+    if not isinstance(text, str):
+        return ""
+
+    if not unicodedata.is_normalized("NFC", text):
+        text = unicodedata.normalize("NFC", text)
+
+    text = text.translate(_URDU_TRANSLATION_TABLE)
+    text = _NON_URDU_PATTERN.sub(' ', text)
+
+    return ' '.join(text.split())
+
+
+def iter_clean_urdu(texts):
+    """Lazily clean an iterable of texts (e.g. lines of a corpus file)."""
+    for text in texts:
+        yield ultra_clean_urdu(text)
+
+
+def clean_urdu_batch(texts):
+    """Clean a list of texts."""
+    return [ultra_clean_urdu(text) for text in texts]
+
+
+# Sentence boundaries: Urdu full stop / question mark (and Latin ones), or line breaks
+_SENTENCE_BOUNDARY_PATTERN = re.compile(r'([۔؟?!]+|\n+)')
+_ROMAN_BOUNDARY_PUNCTUATION = str.maketrans({'۔': '.', '؟': '?'})
+
+
+def split_urdu_sentences(text):
+    """Split text on Urdu sentence boundaries.
+
+    Returns alternating [segment, boundary, segment, ..., segment] parts so
+    that ''.join(parts) == text; whitespace stays attached to the segments.
+    """
+    return _SENTENCE_BOUNDARY_PATTERN.split(text)
+
+
+def romanize_boundary(boundary):
+    """Write a sentence boundary with Roman punctuation (line breaks are kept)."""
+    return boundary.translate(_ROMAN_BOUNDARY_PUNCTUATION)
+
+
+def length_buckets(lengths, batch_size):
+    """Group item indices into batches of similar length, longest first."""
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
@@ -0,0 +1,151 @@
+# translation_stats.py - Thread-safe streaming latency and throughput statistics,
+# plus the per-request stage timer behind translate(..., profile=True)
+
+import math
+import threading
+import time
+
+
+class TranslationStats:
+    """Running translation statistics shared by all translator backends.
+
+    Keeps count, true mean, min/max and characters per second, plus a
+    log-bucketed latency histogram (``buckets_per_decade`` buckets per power
+    of ten between ``min_seconds`` and ``max_seconds``) for p50/p90/p99 in
+    constant memory. Percentiles are accurate to about half a bucket width
+    (~6% with the default 20 buckets per decade). Optional per-stage timings
+    from profiled requests and decode-budget hits are aggregated alongside.
+
+    All methods are safe to call from multiple threads.
+    """
+
+    def __init__(self, min_seconds=1e-4, max_seconds=1e3, buckets_per_decade=20):
+        self.min_seconds = min_seconds
+        self.buckets_per_decade = buckets_per_decade
+        # Bucket 0 holds everything below min_seconds, the last one everything above max_seconds
+        self.num_buckets = math.ceil(math.log10(max_seconds / min_seconds) * buckets_per_decade) + 2
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear all statistics."""
+        with self._lock:
+            self._count = 0
+            self._total_seconds = 0.0
+            self._total_characters = 0
+            self._min = None
+            self._max = None
+            self._buckets = [0] * self.num_buckets
+            self._profiled = 0
+            self._decoder_steps = 0
+            self._stage_seconds = {}
+            self._decoded_sequences = 0
+            self._budget_hits = 0
+            self._started = time.time()
+
+    def record(self, translation_time, characters, stages=None, decoder_steps=0):
+        """Add one translation; ``stages`` maps stage name -> seconds for profiled requests."""
+        bucket = self._bucket(translation_time)
+        with self._lock:
+            self._count += 1
+            self._total_seconds += translation_time
+            self._total_characters += characters
+            self._min = translation_time if self._min is None else min(self._min, translation_time)
+            self._max = translation_time if self._max is None else max(self._max, translation_time)
+            self._buckets[bucket] += 1
+
+            if stages is not None:
+                self._profiled += 1
+                self._decoder_steps += decoder_steps
+                for stage, seconds in stages.items():
+                    self._stage_seconds[stage] = self._stage_seconds.get(stage, 0.0) + seconds
+
+    def record_budget(self, sequences, hits):
+        """Add decoded sequences and how many of them stopped at their step budget."""
+        with self._lock:
+            self._decoded_sequences += sequences
+            self._budget_hits += hits
+
+    def snapshot(self):
+        """Consistent copy of the current statistics as a plain dict (times in seconds)."""
+        with self._lock:
+            count = self._count
+            buckets = list(self._buckets)
+            snapshot = {
+                'total_translations': count,
+                'total_characters_processed': self._total_characters,
+                'total_translation_time': self._total_seconds,
+                'avg_translation_time': self._total_seconds / count if count else 0.0,
+                'min_translation_time': self._min or 0.0,
+                'max_translation_time': self._max or 0.0,
+                'chars_per_second': self._total_characters / self._total_seconds if self._total_seconds else 0.0,
+                'uptime_seconds': time.time() - self._started,
+                'profiled_translations': self._profiled,
+                'mean_decoder_steps': self._decoder_steps / self._profiled if self._profiled else 0.0,
+                'mean_stage_seconds': {
+                    stage: seconds / self._profiled for stage, seconds in self._stage_seconds.items()
+                },
+                'decoded_sequences': self._decoded_sequences,
+                'budget_hits': self._budget_hits,
+                'budget_hit_rate': self._budget_hits / self._decoded_sequences if self._decoded_sequences else 0.0
+            }
+
+        for name, quantile in (('p50', 0.50), ('p90', 0.90), ('p99', 0.99)):
+            snapshot[f'{name}_translation_time'] = self._percentile(
+                buckets, count, quantile, snapshot['min_translation_time'], snapshot['max_translation_time']
+            )
+        return snapshot
+
+    def _bucket(self, seconds):
+        if seconds < self.min_seconds:
+            return 0
+        index = int(math.log10(seconds / self.min_seconds) * self.buckets_per_decade) + 1
+        return min(index, self.num_buckets - 1)
+
+    def _percentile(self, buckets, count, quantile, lowest, highest):
+        """Geometric midpoint of the bucket holding the quantile, clamped to the observed range."""
+        if not count:
+            return 0.0
+
+        rank = quantile * count
+        seen = 0
+        for index, bucket_count in enumerate(buckets):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                break
+
+        midpoint = self.min_seconds * 10 ** ((index - 0.5) / self.buckets_per_decade)
+        return min(max(midpoint, lowest), highest)
+
+
+class StageTimer:
+    """Per-stage wall-clock breakdown of one request, used when profile=True.
+
+    ``mark(stage)`` charges the time since the previous mark to ``stage``
+    (perf_counter, synchronizing CUDA first so GPU work lands in the right
+    stage).
+    """
+
+    def __init__(self, device=None):
+        self.stages = {}
+        self.decoder_steps = 0
+        self._synchronize = device is not None and device.type == 'cuda'
+        self._last = time.perf_counter()
+
+    def mark(self, stage):
+        if self._synchronize:
+            import torch  # only CUDA timers need it; the ONNX backend runs without torch
+            torch.cuda.synchronize()
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self._last
+        self._last = now
+
+    def merge(self, other, share=1):
+        """Add another timer's stages (divided by ``share``) and decoder steps."""
+        for stage, seconds in other.stages.items():
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds / share
+        self.decoder_steps += other.decoder_steps
+
+    def as_dict(self):
+        stages = dict(self.stages)
+        return {'stages': stages, 'decoder_steps': self.decoder_steps, 'total': sum(stages.values())}
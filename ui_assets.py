@@ -0,0 +1,490 @@
+# ui_assets.py - Static HTML/CSS/JS for the Streamlit app
+#
+# Kept out of streamlit_app.py so the strings are built once per process
+# (modules are cached across Streamlit reruns) instead of on every rerun.
+
+# Mobile detection JavaScript
+MOBILE_JS = """
+<script>
+function isMobile() {
+    return window.innerWidth <= 768 || /Android|webOS|iPhone|iPad|iPod|BlackBerry|IEMobile|Opera Mini/i.test(navigator.userAgent);
+}
+
+if (isMobile()) {
+    document.body.classList.add('mobile-mode');
+    // Store mobile state in sessionStorage
+    sessionStorage.setItem('isMobile', 'true');
+}
+</script>
+"""
+
+# Enhanced CSS with mobile-first responsive design
+APP_CSS = """
+<style>
+    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=Noto+Nastaliq+Urdu:wght@400;500;600&display=swap');
+
+    :root {
+        --primary-gradient: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        --secondary-gradient: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
+        --accent-gradient: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
+        --dark-gradient: linear-gradient(135deg, #0c0c0c 0%, #1a1a2e 100%);
+        --surface-gradient: linear-gradient(135deg, #16213e 0%, #0f3460 100%);
+        --glass-bg: rgba(255, 255, 255, 0.08);
+        --glass-border: rgba(255, 255, 255, 0.15);
+        --text-primary: #ffffff;
+        --text-secondary: #b4c6fc;
+        --text-muted: #8892b0;
+        --success: #64ffda;
+        --warning: #ffb74d;
+        --error: #ff5722;
+        --shadow-lg: 0 20px 25px -5px rgba(0, 0, 0, 0.3), 0 10px 10px -5px rgba(0, 0, 0, 0.2);
+        --shadow-xl: 0 25px 50px -12px rgba(0, 0, 0, 0.5);
+    }
+
+    .stApp {
+        background: var(--dark-gradient);
+        color: var(--text-primary);
+        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
+        min-height: 100vh;
+    }
+
+    /* Animated background particles - subtle on mobile */
+    .stApp::before {
+        content: '';
+        position: fixed;
+        top: 0;
+        left: 0;
+        width: 100%;
+        height: 100%;
+        background: 
+            radial-gradient(circle at 20% 50%, rgba(120, 119, 198, 0.05) 0%, transparent 50%),
+            radial-gradient(circle at 80% 20%, rgba(255, 119, 198, 0.05) 0%, transparent 50%),
+            radial-gradient(circle at 40% 80%, rgba(120, 200, 255, 0.05) 0%, transparent 50%);
+        pointer-events: none;
+        z-index: -1;
+        animation: float 30s ease-in-out infinite;
+    }
+
+    @keyframes float {
+        0%, 100% { transform: translateY(0px) rotate(0deg); }
+        50% { transform: translateY(-5px) rotate(0.5deg); }
+    }
+
+    .main-container {
+        background: var(--glass-bg);
+        backdrop-filter: blur(15px);
+        border: 1px solid var(--glass-border);
+        border-radius: 20px;
+        padding: 1.5rem;
+        margin: 1rem auto;
+        max-width: 900px;
+        box-shadow: var(--shadow-lg);
+        position: relative;
+        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
+    }
+
+    .main-container::before {
+        content: '';
+        position: absolute;
+        top: 0;
+        left: 0;
+        right: 0;
+        height: 2px;
+        background: var(--primary-gradient);
+        opacity: 0.6;
+        border-radius: 20px 20px 0 0;
+    }
+
+    .chat-message {
+        padding: 1rem 1.5rem;
+        margin: 1rem 0;
+        border-radius: 16px;
+        max-width: 85%;
+        word-wrap: break-word;
+        line-height: 1.6;
+        position: relative;
+        backdrop-filter: blur(10px);
+        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
+        animation: slideIn 0.4s cubic-bezier(0.4, 0, 0.2, 1);
+    }
+
+    @keyframes slideIn {
+        from { 
+            opacity: 0; 
+            transform: translateY(15px) scale(0.98); 
+        }
+        to { 
+            opacity: 1; 
+            transform: translateY(0) scale(1); 
+        }
+    }
+
+    .user-message {
+        background: var(--primary-gradient);
+        color: var(--text-primary);
+        margin-left: auto;
+        text-align: right;
+        font-family: 'Noto Nastaliq Urdu', 'Inter', sans-serif;
+        font-size: 1rem;
+        font-weight: 500;
+        box-shadow: var(--shadow-lg);
+        border: 1px solid rgba(255, 255, 255, 0.1);
+    }
+
+    .user-message::before {
+        content: '👤';
+        position: absolute;
+        top: -6px;
+        right: -6px;
+        width: 24px;
+        height: 24px;
+        background: var(--accent-gradient);
+        border-radius: 50%;
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        font-size: 0.7rem;
+        box-shadow: var(--shadow-lg);
+    }
+
+    .assistant-message {
+        background: rgba(22, 33, 62, 0.7);
+        color: var(--text-secondary);
+        border: 1px solid rgba(116, 75, 162, 0.3);
+        margin-right: auto;
+        font-size: 0.95rem;
+        line-height: 1.6;
+        box-shadow: var(--shadow-lg);
+        backdrop-filter: blur(15px);
+    }
+
+    .assistant-message::before {
+        content: '🤖';
+        position: absolute;
+        top: -6px;
+        left: -6px;
+        width: 24px;
+        height: 24px;
+        background: var(--secondary-gradient);
+        border-radius: 50%;
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        font-size: 0.7rem;
+        box-shadow: var(--shadow-lg);
+    }
+
+    .header-title {
+        text-align: center;
+        background: var(--primary-gradient);
+        background-clip: text;
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        font-size: 2.5rem;
+        font-weight: 800;
+        margin-bottom: 0.5rem;
+        letter-spacing: -0.03em;
+        position: relative;
+        animation: glow 3s ease-in-out infinite alternate;
+    }
+
+    @keyframes glow {
+        from { filter: drop-shadow(0 0 15px rgba(120, 119, 198, 0.2)); }
+        to { filter: drop-shadow(0 0 25px rgba(120, 119, 198, 0.4)); }
+    }
+
+    .stTextArea textarea {
+        border: 2px solid rgba(116, 75, 162, 0.3) !important;
+        border-radius: 14px !important;
+        font-size: 1rem !important;
+        color: var(--text-primary) !important;
+        background: rgba(22, 33, 62, 0.5) !important;
+        backdrop-filter: blur(10px) !important;
+        padding: 16px !important;
+        font-family: 'Noto Nastaliq Urdu', 'Inter', sans-serif !important;
+        line-height: 1.7 !important;
+        resize: vertical !important;
+        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
+        box-shadow: inset 0 2px 4px rgba(0, 0, 0, 0.1) !important;
+    }
+
+    .stTextArea textarea:focus {
+        border: 2px solid #667eea !important;
+        box-shadow: 0 0 15px rgba(120, 119, 198, 0.2), inset 0 2px 4px rgba(0, 0, 0, 0.1) !important;
+        outline: none !important;
+        transform: scale(1.01) !important;
+    }
+
+    .stTextArea textarea::placeholder {
+        color: var(--text-muted) !important;
+        opacity: 1 !important;
+        font-size: 0.95rem !important;
+    }
+
+    .stTextArea label {
+        color: var(--text-secondary) !important;
+        font-weight: 600 !important;
+        font-size: 0.95rem !important;
+        margin-bottom: 10px !important;
+    }
+
+    .stButton > button[kind="primary"] {
+        background: var(--primary-gradient) !important;
+        color: white !important;
+        border: none !important;
+        border-radius: 12px !important;
+        padding: 14px 28px !important;
+        font-weight: 600 !important;
+        font-size: 1rem !important;
+        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
+        height: 50px !important;
+        box-shadow: var(--shadow-lg) !important;
+        position: relative !important;
+        overflow: hidden !important;
+    }
+
+    .stButton > button[kind="primary"]:hover {
+        transform: translateY(-2px) scale(1.02) !important;
+        box-shadow: var(--shadow-xl), 0 0 25px rgba(120, 119, 198, 0.3) !important;
+    }
+
+    .stButton > button:not([kind="primary"]) {
+        background: rgba(116, 75, 162, 0.15) !important;
+        color: var(--text-secondary) !important;
+        border: 1px solid rgba(116, 75, 162, 0.3) !important;
+        border-radius: 10px !important;
+        padding: 10px 20px !important;
+        font-weight: 500 !important;
+        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
+        height: 42px !important;
+        backdrop-filter: blur(10px) !important;
+    }
+
+    .stButton > button:not([kind="primary"]):hover {
+        background: rgba(116, 75, 162, 0.25) !important;
+        border-color: rgba(116, 75, 162, 0.5) !important;
+        color: var(--text-primary) !important;
+        transform: translateY(-1px) !important;
+    }
+
+    .stSidebar {
+        background: rgba(12, 12, 12, 0.95) !important;
+        backdrop-filter: blur(20px) !important;
+        border-right: 1px solid rgba(116, 75, 162, 0.2) !important;
+    }
+
+    .stSidebar .stMarkdown h3 {
+        color: var(--text-primary) !important;
+        font-weight: 700 !important;
+        font-size: 1.1rem !important;
+        margin-bottom: 1rem !important;
+        padding-bottom: 0.5rem !important;
+        border-bottom: 2px solid var(--primary-gradient) !important;
+        background: var(--primary-gradient) !important;
+        background-clip: text !important;
+        -webkit-background-clip: text !important;
+        -webkit-text-fill-color: transparent !important;
+    }
+
+    .message-time {
+        font-size: 0.8rem;
+        opacity: 0.6;
+        margin-top: 0.75rem;
+        font-weight: 400;
+        color: var(--text-muted);
+    }
+
+    .stForm {
+        border: none !important;
+        background: transparent !important;
+    }
+
+    .stSpinner > div {
+        border-top-color: #667eea !important;
+    }
+
+    .loading-animation {
+        display: inline-block;
+        width: 36px;
+        height: 36px;
+        border: 3px solid rgba(120, 119, 198, 0.2);
+        border-radius: 50%;
+        border-top-color: #667eea;
+        animation: spin 1s linear infinite, pulse 2s ease-in-out infinite;
+    }
+
+    @keyframes spin {
+        to { transform: rotate(360deg); }
+    }
+
+    @keyframes pulse {
+        0%, 100% { box-shadow: 0 0 15px rgba(120, 119, 198, 0.2); }
+        50% { box-shadow: 0 0 25px rgba(120, 119, 198, 0.4); }
+    }
+
+    .copy-button {
+        background: var(--accent-gradient) !important;
+        border: none !important;
+        border-radius: 6px !important;
+        padding: 4px 10px !important;
+        color: white !important;
+        font-size: 0.75rem !important;
+        cursor: pointer !important;
+        transition: all 0.3s ease !important;
+        margin-top: 8px !important;
+        opacity: 0.8 !important;
+    }
+
+    .copy-button:hover {
+        opacity: 1 !important;
+        transform: scale(1.05) !important;
+    }
+
+    .word-count {
+        color: var(--text-muted);
+        font-size: 0.8rem;
+        text-align: right;
+        margin-top: 6px;
+        font-weight: 500;
+        opacity: 0.4;
+        transition: opacity 0.3s ease;
+    }
+
+    .quality-indicator {
+        display: inline-block;
+        width: 6px;
+        height: 6px;
+        border-radius: 50%;
+        margin-left: 6px;
+        animation: blink 2s infinite;
+    }
+
+    .quality-high { background-color: var(--success); }
+    .quality-medium { background-color: var(--warning); }
+    .quality-low { background-color: var(--error); }
+
+    @keyframes blink {
+        0%, 50% { opacity: 1; }
+        51%, 100% { opacity: 0.4; }
+    }
+
+    .main .block-container {
+        max-width: 1000px !important;
+        padding-left: 1.5rem !important;
+        padding-right: 1.5rem !important;
+    }
+
+    hr {
+        border: none !important;
+        height: 1px !important;
+        background: var(--primary-gradient) !important;
+        opacity: 0.2 !important;
+        border-radius: 1px !important;
+    }
+
+    .stMarkdown, .stText {
+        color: var(--text-primary) !important;
+    }
+
+    /* Enhanced scrollbar */
+    ::-webkit-scrollbar {
+        width: 6px;
+    }
+
+    ::-webkit-scrollbar-track {
+        background: rgba(116, 75, 162, 0.1);
+        border-radius: 3px;
+    }
+
+    ::-webkit-scrollbar-thumb {
+        background: var(--primary-gradient);
+        border-radius: 3px;
+    }
+
+    ::-webkit-scrollbar-thumb:hover {
+        background: var(--accent-gradient);
+    }
+
+    /* Mobile optimizations */
+    @media (max-width: 768px) {
+        .main-container {
+            margin: 0.5rem;
+            padding: 1rem;
+            border-radius: 16px;
+        }
+
+        .chat-message {
+            max-width: 95%;
+            padding: 0.75rem 1rem;
+            font-size: 0.9rem;
+        }
+
+        .header-title {
+            font-size: 2rem;
+            margin-bottom: 1rem;
+        }
+
+        .stTextArea textarea {
+            font-size: 0.95rem !important;
+            padding: 12px !important;
+        }
+
+        .stButton > button[kind="primary"] {
+            height: 46px !important;
+            font-size: 0.95rem !important;
+            padding: 12px 24px !important;
+        }
+
+        .stButton > button:not([kind="primary"]) {
+            height: 40px !important;
+            font-size: 0.85rem !important;
+        }
+
+        .user-message::before,
+        .assistant-message::before {
+            width: 20px;
+            height: 20px;
+            font-size: 0.6rem;
+            top: -4px;
+        }
+
+        .user-message::before {
+            right: -4px;
+        }
+
+        .assistant-message::before {
+            left: -4px;
+        }
+
+        .main .block-container {
+            padding-left: 1rem !important;
+            padding-right: 1rem !important;
+        }
+
+        .word-count {
+            font-size: 0.75rem;
+            opacity: 0.3;
+        }
+
+        .stApp::before {
+            animation: float 40s ease-in-out infinite;
+        }
+    }
+
+    /* Extra small devices */
+    @media (max-width: 480px) {
+        .main-container {
+            margin: 0.25rem;
+            padding: 0.75rem;
+        }
+
+        .header-title {
+            font-size: 1.75rem;
+        }
+
+        .chat-message {
+            padding: 0.5rem 0.75rem;
+        }
+    }
+</style>
+"""